@@ -0,0 +1,205 @@
+"""Incremental per-disease and per-symptom statistics.
+
+AggregationEngine keeps running counts plus Welford mean/variance and min/max of the symptom
+count, per disease and per symptom. Appending a batch costs O(batch): the batch is summarized
+with bincount/matrix sums and merged into the running state (Chan et al.), so nothing is
+recomputed over records already seen. The engine renders the same disease_stats, symptom_freq
+and symptoms_per_disease frames as dataset.build_aggregates.
+
+    python aggregates.py --rows 1000000 --batch-size 50000    # check incremental == full recompute
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import dataset
+
+
+class RunningStats:
+    # Vectorized Welford state for a fixed set of groups
+    def __init__(self, groups):
+        self.count = np.zeros(groups, dtype=np.int64)
+        self.mean = np.zeros(groups, dtype=np.float64)
+        self.m2 = np.zeros(groups, dtype=np.float64)
+        self.min = np.full(groups, np.inf)
+        self.max = np.full(groups, -np.inf)
+
+    def merge(self, count, mean, m2, minimum, maximum):
+        # Combines a batch summary (same shape as the state) into the running state
+        total = self.count + count
+        seen = total > 0
+        delta = mean - self.mean
+        weight = np.divide(count, total, out=np.zeros_like(self.mean), where=seen)
+        self.mean = np.where(seen, self.mean + delta * weight, 0.0)
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    @property
+    def variance(self):
+        # Sample variance (ddof=1), NaN below two observations like pandas
+        return np.divide(self.m2, self.count - 1, out=np.full_like(self.m2, np.nan), where=self.count > 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+def _group_summary(codes, values, groups):
+    # Per-group count, mean, M2, min and max of one batch
+    count = np.bincount(codes, minlength=groups)
+    mean = np.divide(np.bincount(codes, weights=values, minlength=groups), count,
+                     out=np.zeros(groups), where=count > 0)
+    m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=groups)
+    minimum = np.full(groups, np.inf)
+    maximum = np.full(groups, -np.inf)
+    np.minimum.at(minimum, codes, values)
+    np.maximum.at(maximum, codes, values)
+    return count, mean, m2, minimum, maximum
+
+
+def _membership_summary(members, values):
+    # Same summary when a row can belong to several groups (members is rows x groups, bool)
+    weights = members.astype(np.float64)
+    count = members.sum(axis=0)
+    mean = np.divide(values @ weights, count, out=np.zeros(members.shape[1]), where=count > 0)
+    m2 = (((values[:, None] - mean[None, :]) ** 2) * weights).sum(axis=0)
+    minimum = np.where(members, values[:, None], np.inf).min(axis=0)
+    maximum = np.where(members, values[:, None], -np.inf).max(axis=0)
+    return count, mean, m2, minimum, maximum
+
+
+class AggregationEngine:
+    def __init__(self, diseases, vocabulary):
+        self.diseases = list(diseases)
+        self.vocabulary = list(vocabulary)
+        self._codes = {d: i for i, d in enumerate(self.diseases)}
+        self.rows = 0
+        # Symptom_Count statistics of the records of each disease / containing each symptom
+        self.by_disease = RunningStats(len(self.diseases))
+        self.by_symptom = RunningStats(len(self.vocabulary))
+
+    @classmethod
+    def from_frame(cls, df, vocabulary=None, batch_size=None):
+        vocabulary = vocabulary or dataset.symptom_vocabulary()
+        engine = cls(df["Disease"].cat.categories, vocabulary)
+        step = batch_size or max(len(df), 1)
+        for start in range(0, len(df), step):
+            engine.add_frame(df.iloc[start:start + step])
+        return engine
+
+    def add(self, disease_codes, masks):
+        # Absorbs a batch of (disease index, symptom bitmask) records
+        disease_codes = np.asarray(disease_codes, dtype=np.int64)
+        masks = np.asarray(masks)
+        if not len(masks):
+            return
+        counts = dataset.popcount(masks).astype(np.float64)
+        self.by_disease.merge(*_group_summary(disease_codes, counts, len(self.diseases)))
+
+        bits = np.left_shift(np.ones(1, dtype=masks.dtype), np.arange(len(self.vocabulary), dtype=masks.dtype))
+        members = (masks[:, None] & bits[None, :]) != 0
+        self.by_symptom.merge(*_membership_summary(members, counts))
+        self.rows += len(masks)
+
+    def add_frame(self, df):
+        # Compact dataset rows; disease categories are matched by name
+        categories = list(df["Disease"].cat.categories)
+        if categories == self.diseases:
+            codes = df["Disease"].cat.codes.to_numpy()
+        else:
+            lookup = np.array([self._codes[d] for d in categories], dtype=np.int64)
+            codes = lookup[df["Disease"].cat.codes.to_numpy()]
+        self.add(codes, df["Symptom_Mask"].to_numpy())
+
+    def disease_stats(self):
+        counts = self.by_disease.count
+        return dataset.build_disease_stats(
+            {d: int(c) for d, c in zip(self.diseases, counts) if c}, self.rows
+        )
+
+    def symptom_freq(self):
+        return dataset.build_symptom_freq(dict(zip(self.vocabulary, self.by_symptom.count.tolist())))
+
+    def symptoms_per_disease(self):
+        stats = self.by_disease
+        seen = stats.count > 0
+        frame = pd.DataFrame({
+            "Disease": np.array(self.diseases, dtype=object)[seen],
+            "mean": stats.mean[seen],
+            "min": stats.min[seen].astype(np.uint8),
+            "max": stats.max[seen].astype(np.uint8),
+            "std": stats.std[seen],
+        }).round(2)
+        frame["Disease"] = frame["Disease"].astype(str)
+        return frame.sort_values("Disease").reset_index(drop=True)
+
+    def symptom_stats(self):
+        # Per-symptom occurrences and the symptom count of the records it appears in
+        stats = self.by_symptom
+        seen = stats.count > 0
+        return pd.DataFrame({
+            "Symptom": np.array(self.vocabulary, dtype=object)[seen],
+            "Frequency": stats.count[seen],
+            "mean": stats.mean[seen],
+            "min": stats.min[seen].astype(np.uint8),
+            "max": stats.max[seen].astype(np.uint8),
+            "std": stats.std[seen],
+        }).round(2).sort_values("Frequency", ascending=False, kind="stable").reset_index(drop=True)
+
+    def frames(self):
+        return self.disease_stats(), self.symptom_freq(), self.symptoms_per_disease()
+
+
+def check_incremental(num_rows=dataset.NUM_ROWS, seed=dataset.SEED, batch_size=10000):
+    # Engine fed in batches vs the pandas groupby/bincount recompute over the whole frame.
+    # Returns a list of mismatching frames (empty when they agree).
+    df = dataset.generate_dataset(num_rows, seed)[0]
+    vocabulary = dataset.symptom_vocabulary()
+    engine = AggregationEngine.from_frame(df, vocabulary, batch_size=batch_size)
+    diseases = list(df["Disease"].cat.categories)
+    disease_counts = np.bincount(df["Disease"].cat.codes.to_numpy(), minlength=len(diseases))
+    expected = (
+        dataset.build_disease_stats({d: int(c) for d, c in zip(diseases, disease_counts) if c}, len(df)),
+        dataset.build_symptom_freq(dict(zip(vocabulary, dataset.symptom_bit_counts(
+            df["Symptom_Mask"].to_numpy(), vocabulary).tolist()))),
+        dataset.build_symptoms_per_disease(df),
+    )
+    problems = []
+    for name, actual, reference in zip(["disease_stats", "symptom_freq", "symptoms_per_disease"],
+                                       engine.frames(), expected):
+        try:
+            pd.testing.assert_frame_equal(actual, reference, check_exact=False, atol=0.011)
+        except AssertionError as exc:
+            problems.append(f"{name}: {exc}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check incremental aggregates against a full recompute.")
+    parser.add_argument("--rows", type=int, default=dataset.NUM_ROWS)
+    parser.add_argument("--seed", type=int, default=dataset.SEED)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    df = dataset.generate_dataset(args.rows, args.seed)[0]
+    engine = AggregationEngine(df["Disease"].cat.categories, dataset.symptom_vocabulary())
+    start = time.perf_counter()
+    for offset in range(0, len(df), args.batch_size):
+        engine.add_frame(df.iloc[offset:offset + args.batch_size])
+    seconds = time.perf_counter() - start
+    print(f"Absorbed {len(df):,} rows in {-(-len(df) // args.batch_size)} batches in {seconds:.3f}s "
+          f"({len(df) / seconds:,.0f} rows/s)", file=sys.stderr)
+
+    problems = check_incremental(args.rows, args.seed, args.batch_size)
+    print("\n".join(problems) or "Incremental aggregates match the full recompute")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
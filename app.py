@@ -1,106 +1,97 @@
 import streamlit as st
-import joblib
-import pandas as pd
 import numpy as np
-import random
-from collections import Counter
+import pandas as pd
+import plotly.express as px
 import csv
 import io
+import html
+import hmac
+import os
+import dataset
+import exports
+import instrumentation
+import predictor
+import prediction_log
+import time
+from cooccurrence import cooccurrence_matrix, disease_probabilities
+from dataset_index import DatasetIndex
+from inference_gateway import GatewayBusy, GatewayTimeout
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache, canonical_symptoms, canonical_text
+from symptom_index import MAX_INPUT_CHARS, SymptomIndex, split_tokens
 
-# Load the trained model
+# Versioned models from the registry directory. Each loaded version is warmed up and gets its own
+# inference gateway (a small worker pool behind a bounded queue); a watcher thread swaps in new
+# versions in the background, so no session ever waits on a model load after startup
+@st.cache_resource(on_release=lambda registry: registry.close())
+def get_model_registry():
+    return ModelRegistry().start()
+
+# Matching index over the known symptom vocabulary for free-text input
 @st.cache_resource
-def load_model():
-    return joblib.load("disease_predictor_model.joblib")
+def get_symptom_index():
+    symptom_freq = get_symptom_freq()
+    return SymptomIndex(
+        dataset.symptom_vocabulary() + symptom_freq['Symptom'].tolist(),
+        frequencies=dict(zip(symptom_freq['Symptom'], symptom_freq['Frequency']))
+    )
+
+# Number of diseases shown in the differential ranking
+TOP_K = 3
 
-model = load_model()
+# Predictions shared by every session in this process, keyed on the canonical symptom set
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(maxsize=4096)
+
+# Row indexes over the compact frame back the Dataset page browser; held once, never copied
+@st.cache_resource
+def get_dataset_index():
+    return DatasetIndex(dataset.load_product("df"))
 
-# Generate dataset using your code
+# Data products are loaded lazily and cached individually, so each page only pays for what it
+# renders. The dataset is generated with a seeded NumPy sampler and persisted on disk, which lets
+# restarts and other replicas read a single small frame without regenerating anything.
 @st.cache_data
-def generate_dataset():
-    disease_symptoms = {
-        "Common Cold": ["fever", "cough", "sore throat", "runny nose", "sneezing"],
-        "Flu": ["fever", "cough", "headache", "muscle pain", "fatigue", "chills"],
-        "Bronchitis": ["cough", "shortness of breath", "chest pain", "fatigue", "sore throat"],
-        "Dengue": ["fever", "headache", "joint pain", "rash", "nausea", "vomiting"],
-        "Malaria": ["fever", "chills", "sweating", "headache", "muscle pain"],
-        "Tuberculosis": ["fever", "cough", "night sweats", "weight loss", "fatigue"],
-        "Gastroenteritis": ["diarrhea", "abdominal pain", "fever", "nausea", "vomiting"],
-        "Allergy": ["itching", "rash", "redness", "swelling", "sneezing"],
-        "Diabetes": ["fatigue", "weight loss", "blurred vision", "increased thirst"],
-        "COVID-19": ["fever", "cough", "loss of taste", "shortness of breath", "fatigue"],
-    }
-    
-    # Set seed for reproducibility
-    random.seed(42)
-    
-    # Generate 150000 rows
-    num_rows = 159874
-    rows = []
-    
-    for _ in range(num_rows):
-        disease = random.choice(list(disease_symptoms.keys()))
-        symptoms_list = disease_symptoms[disease]
-        symptom_count = random.randint(2, len(symptoms_list))
-        symptoms = random.sample(symptoms_list, symptom_count)
-        symptom_str = ", ".join(symptoms)
-        rows.append([symptom_str, disease])
-    
-    # Create DataFrame
-    df = pd.DataFrame(rows, columns=["Symptoms", "Disease"])
-    
-    # Add symptom count
-    df['Symptom_Count'] = df['Symptoms'].apply(lambda x: len(x.split(',')))
-    
-    # Extract all symptoms for analysis
-    all_symptoms = []
-    for symptoms_str in df['Symptoms']:
-        symptoms = [s.strip() for s in symptoms_str.split(',')]
-        all_symptoms.extend(symptoms)
-    
-    # Create symptom frequency data
-    symptom_counts = Counter(all_symptoms)
-    symptom_freq_df = pd.DataFrame(list(symptom_counts.items()), columns=['Symptom', 'Frequency'])
-    symptom_freq_df = symptom_freq_df.sort_values('Frequency', ascending=False).reset_index(drop=True)
-    symptom_freq_df['Percentage'] = (symptom_freq_df['Frequency'] / len(all_symptoms) * 100).round(2)
-    
-    # Disease distribution
-    disease_stats = df['Disease'].value_counts().reset_index()
-    disease_stats.columns = ['Disease', 'Cases']
-    disease_stats['Percentage'] = (disease_stats['Cases'] / len(df) * 100).round(2)
-    
-    # Add severity and recovery days (simulated for demo)
-    severity_map = {
-        'Common Cold': 'Low', 'Flu': 'Medium', 'Bronchitis': 'Medium',
-        'Dengue': 'High', 'Malaria': 'High', 'Tuberculosis': 'High',
-        'Gastroenteritis': 'Medium', 'Allergy': 'Low', 'Diabetes': 'High',
-        'COVID-19': 'High'
-    }
-    
-    recovery_map = {
-        'Common Cold': 7, 'Flu': 10, 'Bronchitis': 14,
-        'Dengue': 21, 'Malaria': 28, 'Tuberculosis': 180,
-        'Gastroenteritis': 5, 'Allergy': 3, 'Diabetes': 365,
-        'COVID-19': 14
-    }
-    
-    disease_stats['Severity'] = disease_stats['Disease'].map(severity_map)
-    disease_stats['Recovery_Days'] = disease_stats['Disease'].map(recovery_map)
-    
-    # Monthly data (simulated)
-    monthly_data = pd.DataFrame({
-        'Month': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
-        'Predictions': [1250, 1180, 1420, 1680, 1890, 2100, 2300, 2150, 1980, 1750, 1600, 1400],
-        'Accuracy': [94.2, 95.1, 93.8, 96.2, 95.7, 96.8, 97.1, 96.5, 95.9, 96.3, 95.8, 96.0]
-    })
-    
-    # Symptoms per disease stats
-    symptoms_per_disease = df.groupby('Disease')['Symptom_Count'].agg(['mean', 'min', 'max', 'std']).round(2)
-    symptoms_per_disease = symptoms_per_disease.reset_index()
-    
-    return df, disease_stats, symptom_freq_df, monthly_data, symptoms_per_disease, all_symptoms
+def get_disease_stats():
+    return dataset.load_product("disease_stats")
+
+@st.cache_data
+def get_symptom_freq():
+    return dataset.load_product("symptom_freq")
+
+@st.cache_data
+def get_symptoms_per_disease():
+    return dataset.load_product("symptoms_per_disease")
+
+@st.cache_data
+def get_cooccurrence():
+    return dataset.load_product("cooccurrence")
+
+@st.cache_data
+def get_disease_given_symptom():
+    return dataset.load_product("disease_given_symptom")
+
+# Every Home page prediction is appended to the local event log by a background writer
+@st.cache_resource
+def get_prediction_log():
+    return prediction_log.PredictionLog()
+
+# Trends read the pre-rolled monthly summary, refreshed every few seconds
+@st.cache_data(ttl=10)
+def get_monthly_trend():
+    return prediction_log.monthly_trend()
+
+# Metrics are rewritten to a Prometheus textfile every few seconds by one background thread
+@st.cache_resource
+def start_metrics_dump():
+    if instrumentation.METRICS_FILE:
+        return instrumentation.start_file_dump()
+
+# The metrics panel is only offered when an admin token is configured
+ADMIN_TOKEN = os.environ.get("DISEASE_ADMIN_TOKEN", "")
 
-# Load all data
-df, disease_stats, symptom_freq, monthly_data, symptoms_per_disease, all_symptoms = generate_dataset()
+start_metrics_dump()
 
 # Enhanced CSS
 st.markdown("""
@@ -220,8 +211,16 @@ st.set_page_config(
 st.sidebar.title("🧭 Navigation")
 page = st.sidebar.selectbox("Choose a section:", 
                            ["🏠 Home", "📊 Analytics", "📈 Statistics", "📋 Dataset", "👥 Our Team", "📞 Contact"])
+page_start = time.perf_counter()
 
 if page == "🏠 Home":
+    # One deployment for the whole run, so a swap mid-request can't mix versions
+    deployment = get_model_registry().active()
+    gateway = deployment.gateway
+    model_signature = (deployment.version, *deployment.signature)
+    disease_stats = get_disease_stats()
+    symptom_freq = get_symptom_freq()
+
     # Header section
     st.markdown('<h1 class="main-header">🩺 AI Disease Predictor</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Get instant health insights based on your symptoms</p>', unsafe_allow_html=True)
@@ -232,7 +231,7 @@ if page == "🏠 Home":
     with col1:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="stats-number">{len(df):,}</div>
+            <div class="stats-number">{disease_stats['Cases'].sum():,}</div>
             <div style="color: white;">Records Analyzed</div>
         </div>
         """, unsafe_allow_html=True)
@@ -272,9 +271,20 @@ if page == "🏠 Home":
             "Describe your symptoms:",
             placeholder="e.g., fever, headache, sore throat, fatigue",
             height=120,
+            max_chars=MAX_INPUT_CHARS,
             help="Enter each symptom separated by commas. Be as detailed as possible for better accuracy."
         )
         
+        # Show how the input maps onto known symptoms before predicting
+        recognized, unrecognized = get_symptom_index().canonicalize(user_input)
+        if recognized:
+            st.markdown("**Recognized:** " + "".join(
+                f'<span class="symptom-chip" title="{html.escape(match.token)} ({match.method})">{match.symptom}</span>'
+                for match in recognized
+            ), unsafe_allow_html=True)
+        if unrecognized:
+            st.caption("❔ Not recognized: " + ", ".join(unrecognized))
+        
         # Predict button
         predict_button = st.button("🔍 Analyze Symptoms", type="primary")
     
@@ -289,11 +299,37 @@ if page == "🏠 Home":
     if predict_button:
         if user_input.strip():
             with st.spinner("🤖 AI is analyzing your symptoms..."):
-                import time
-                time.sleep(1)
-                
                 try:
-                    predicted_label = model.predict([user_input])[0]
+                    prediction_cache = get_prediction_cache()
+                    # Recognized symptoms replace the raw text; fall back to it if nothing matched
+                    if recognized:
+                        symptom_key = canonical_symptoms(", ".join(match.symptom for match in recognized))
+                    else:
+                        symptom_key = canonical_symptoms(user_input)
+                    start = time.perf_counter()
+                    cached = prediction_cache.get(symptom_key, model_signature) if symptom_key else None
+                    cache_hit = cached is not None
+                    if cache_hit:
+                        ranking, score_kind = cached
+                        inference_time = time.perf_counter() - start
+                        stage_times = [("cache", inference_time)]
+                    else:
+                        model_input = canonical_text(symptom_key) if symptom_key else user_input
+                        result, inference_time, stage_times = gateway.timed_topk([model_input], k=TOP_K)
+                        ranking, score_kind = predictor.topk_rows(result)[0], result.kind
+                        if symptom_key:
+                            prediction_cache.put(symptom_key, (ranking, score_kind), model_signature)
+                    predicted_label, top_score = ranking[0]
+                    instrumentation.PREDICTION.observe(
+                        time.perf_counter() - start, source="cache" if cache_hit else "model"
+                    )
+                    get_prediction_log().record(
+                        predicted_label,
+                        confidence=top_score if score_kind == "probability" else None,
+                        symptom_count=len(recognized) or len(split_tokens(user_input)),
+                        latency_ms=inference_time * 1000,
+                        cache_hit=cache_hit,
+                    )
                     
                     # Display result
                     st.markdown(f"""
@@ -307,11 +343,41 @@ if page == "🏠 Home":
                     # Additional analysis
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        st.metric("Symptoms Analyzed", len(user_input.split(',')))
+                        st.metric("Symptoms Analyzed", len(recognized) or len(split_tokens(user_input)))
                     with col2:
-                        st.metric("Confidence Level", "High")
+                        if score_kind == "probability":
+                            st.metric("Confidence Level", f"{top_score:.0%}")
+                        elif score_kind == "decision":
+                            st.metric("Decision Score", f"{top_score:.2f}")
+                        else:
+                            st.metric("Confidence Level", "n/a")
                     with col3:
-                        st.metric("Processing Time", "< 1 sec")
+                        st.metric("Processing Time", predictor.format_duration(inference_time))
+                    
+                    if len(stage_times) > 1:
+                        st.caption("⏱️ " + " · ".join(
+                            f"{stage}: {predictor.format_duration(seconds)}" for stage, seconds in stage_times
+                        ))
+                    
+                    # Differential ranking from the same model pass
+                    if len(ranking) > 1:
+                        st.markdown("#### 🩺 Differential Ranking")
+                        for rank, (label, score) in enumerate(ranking, start=1):
+                            if score_kind == "probability":
+                                st.progress(score, text=f"{rank}. {label} — {score:.1%}")
+                            else:
+                                st.markdown(f"{rank}. **{label}** (score {score:.2f})")
+                    
+                    cache_stats = prediction_cache.stats()
+                    gateway_stats = gateway.stats()
+                    queue_wait = gateway_stats['queue_wait_ms']['p50']
+                    st.caption(
+                        f"🗄️ Prediction cache {'hit' if cache_hit else 'miss'} · "
+                        f"{cache_stats['hits']:,} hits / {cache_stats['misses']:,} misses · "
+                        f"queue depth {gateway_stats['queue_depth']}"
+                        + (f", median wait {queue_wait:.1f} ms" if queue_wait is not None else "")
+                        + f" · model {deployment.version}"
+                    )
                     
                     # Show related information
                     if predicted_label in disease_stats['Disease'].values:
@@ -332,6 +398,10 @@ if page == "🏠 Home":
                     Please consult with a healthcare provider for proper diagnosis and treatment.
                     """)
                     
+                except GatewayBusy:
+                    st.warning("⏳ The predictor is busy right now. Please try again in a moment.")
+                except GatewayTimeout:
+                    st.warning("⏳ The prediction took too long. Please try again in a moment.")
                 except Exception as e:
                     st.error(f"❌ An error occurred during prediction: {str(e)}")
         else:
@@ -339,6 +409,9 @@ if page == "🏠 Home":
 
 elif page == "📊 Analytics":
     st.markdown('<h1 class="main-header">📊 Analytics Dashboard</h1>', unsafe_allow_html=True)
+    disease_stats = get_disease_stats()
+    symptom_freq = get_symptom_freq()
+    monthly_trend = get_monthly_trend()
     
     # Top metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -360,7 +433,8 @@ elif page == "📊 Analytics":
         """, unsafe_allow_html=True)
     
     with col3:
-        avg_symptoms = df['Symptom_Count'].mean()
+        # Total symptom occurrences over total records, without touching the full dataset
+        avg_symptoms = symptom_freq['Frequency'].sum() / disease_stats['Cases'].sum()
         st.markdown(f"""
         <div class="highlight-metric">
             <h3>{avg_symptoms:.1f}</h3>
@@ -386,19 +460,46 @@ elif page == "📊 Analytics":
     
     with col2:
         st.subheader("📈 Monthly Predictions Trend")
-        st.line_chart(monthly_data.set_index('Month')['Predictions'])
+        if len(monthly_trend):
+            st.line_chart(monthly_trend.set_index('Month')['Predictions'])
+        else:
+            st.info("No predictions have been logged yet.")
     
     # Symptom frequency chart
     st.subheader("🔍 Most Common Symptoms")
     top_symptoms = symptom_freq.head(15)
     st.bar_chart(top_symptoms.set_index('Symptom')['Frequency'])
     
+    # Symptom pairs and what each symptom points to, precomputed with the dataset
+    col1, col2 = st.columns([3, 2])
+    
+    with col1:
+        st.subheader("🧩 Symptom Co-occurrence")
+        matrix = cooccurrence_matrix(get_cooccurrence())
+        fig = px.imshow(matrix, color_continuous_scale="Blues", labels={"color": "Records"}, aspect="auto")
+        fig.update_layout(xaxis_title=None, yaxis_title=None, margin=dict(l=0, r=0, t=0, b=0), height=520)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("🧭 P(Disease | Symptom)")
+        given_symptom = st.selectbox("Symptom", symptom_freq['Symptom'].tolist())
+        probabilities = disease_probabilities(get_disease_given_symptom(), given_symptom)
+        st.dataframe(
+            probabilities,
+            column_config={"Probability": st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1)},
+            hide_index=True,
+            use_container_width=True
+        )
+    
     # Additional charts
     col1, col2 = st.columns(2)
     
     with col1:
-        st.subheader("🎯 Model Accuracy Over Time")
-        st.line_chart(monthly_data.set_index('Month')['Accuracy'])
+        st.subheader("🎯 Average Confidence Over Time")
+        if monthly_trend['Avg_Confidence'].notna().any():
+            st.line_chart(monthly_trend.set_index('Month')['Avg_Confidence'])
+        else:
+            st.info("No scored predictions have been logged yet.")
     
     with col2:
         st.subheader("⚡ Recovery Time Analysis")
@@ -406,12 +507,15 @@ elif page == "📊 Analytics":
 
 elif page == "📈 Statistics":
     st.markdown('<h1 class="main-header">📈 Detailed Statistics</h1>', unsafe_allow_html=True)
+    disease_stats = get_disease_stats()
+    symptom_freq = get_symptom_freq()
+    symptoms_per_disease = get_symptoms_per_disease()
     
     # Summary statistics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Records", f"{len(df):,}")
+        st.metric("Total Records", f"{disease_stats['Cases'].sum():,}")
     with col2:
         st.metric("Unique Diseases", len(disease_stats))
     with col3:
@@ -435,19 +539,44 @@ elif page == "📈 Statistics":
 
 elif page == "📋 Dataset":
     st.markdown('<h1 class="main-header">📋 Dataset Overview</h1>', unsafe_allow_html=True)
+    dataset_index = get_dataset_index()
+    disease_stats = get_disease_stats()
     
     # Dataset info
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.info(f"**Total Records:** {len(df):,}")
+        st.info(f"**Total Records:** {len(dataset_index):,}")
     with col2:
         st.info(f"**Data Quality:** 100% Complete")
     with col3:
         st.info(f"**Last Updated:** Today")
     
-    # Sample data
-    st.subheader("📄 Sample Dataset")
-    st.dataframe(df.head(20), use_container_width=True)
+    # Dataset browser: filters run over the row indexes, only the visible page is rendered
+    st.subheader("📄 Browse Records")
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_diseases = st.multiselect("Disease", sorted(dataset_index.diseases))
+        required_symptoms = st.multiselect("Has all of these symptoms", dataset_index.vocabulary)
+    with col2:
+        count_range = st.slider("Symptom count", 1, len(dataset_index.vocabulary), (1, len(dataset_index.vocabulary)))
+        excluded_symptoms = st.multiselect(
+            "Has none of these symptoms",
+            [s for s in dataset_index.vocabulary if s not in required_symptoms]
+        )
+    
+    rows = dataset_index.query(
+        tuple(selected_diseases), tuple(required_symptoms), tuple(excluded_symptoms),
+        count_range[0], count_range[1]
+    )
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Rows per page", [20, 50, 100, 500], index=1)
+    with col2:
+        page_number = st.number_input("Page", min_value=1, max_value=max(1, -(-len(rows) // page_size)), value=1)
+    result_page = dataset_index.page(rows, page_number, page_size)
+    with col3:
+        st.caption(f"{result_page.total:,} matching records · page {result_page.page:,} of {result_page.pages:,}")
+    st.dataframe(result_page.frame, use_container_width=True)
     
     # Dataset statistics
     st.subheader("📊 Dataset Statistics")
@@ -456,8 +585,8 @@ elif page == "📋 Dataset":
     
     with col1:
         st.markdown("**Symptom Count Distribution**")
-        symptom_count_dist = df['Symptom_Count'].value_counts().sort_index()
-        st.bar_chart(symptom_count_dist)
+        symptom_count_dist = dataset_index.count_distribution()
+        st.bar_chart(pd.Series(symptom_count_dist, name="count"))
     
     with col2:
         st.markdown("**Disease Severity Distribution**")
@@ -467,33 +596,38 @@ elif page == "📋 Dataset":
     # Download section
     st.subheader("💾 Download Dataset")
     
+    # Files are only built when a button is clicked, then reused for this dataset version
+    export_format = st.radio(
+        "Format",
+        ["csv", "csv.gz", "parquet"],
+        format_func={"csv": "CSV", "csv.gz": "CSV (gzip)", "parquet": "Parquet"}.get,
+        horizontal=True
+    )
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        csv_data = df.to_csv(index=False)
         st.download_button(
             label="📥 Download Full Dataset",
-            data=csv_data,
-            file_name="disease_symptom_dataset.csv",
-            mime="text/csv"
+            data=lambda: exports.read_export("df", export_format),
+            file_name=exports.file_name("df", export_format),
+            mime=exports.mime_type(export_format)
         )
     
     with col2:
-        disease_csv = disease_stats.to_csv(index=False)
         st.download_button(
             label="📥 Download Disease Stats",
-            data=disease_csv,
-            file_name="disease_statistics.csv",
-            mime="text/csv"
+            data=lambda: exports.read_export("disease_stats", export_format),
+            file_name=exports.file_name("disease_stats", export_format),
+            mime=exports.mime_type(export_format)
         )
     
     with col3:
-        symptom_csv = symptom_freq.to_csv(index=False)
         st.download_button(
             label="📥 Download Symptom Stats",
-            data=symptom_csv,
-            file_name="symptom_statistics.csv",
-            mime="text/csv"
+            data=lambda: exports.read_export("symptom_freq", export_format),
+            file_name=exports.file_name("symptom_freq", export_format),
+            mime=exports.mime_type(export_format)
         )
 
 elif page == "👥 Our Team":
@@ -642,6 +776,32 @@ elif page == "📞 Contact":
                 else:
                     st.error("❌ Please fill in all required fields.")
 
+instrumentation.PAGE_RENDER.observe(time.perf_counter() - page_start, page=page.split(" ", 1)[1])
+
+# Live latency percentiles for operators, refreshed in place
+@st.fragment(run_every=5)
+def metrics_panel():
+    histograms, counters = instrumentation.REGISTRY.snapshot()
+    if histograms:
+        latency = pd.DataFrame(histograms).set_index(["metric", "labels"])
+        st.dataframe(latency[["count", "p50_ms", "p95_ms", "p99_ms"]].round(2), use_container_width=True)
+    if counters:
+        st.dataframe(pd.DataFrame(counters).set_index(["metric", "labels"]), use_container_width=True)
+    st.caption(f"Prometheus dump: {instrumentation.METRICS_FILE or 'off'}")
+
+def model_panel():
+    registry = get_model_registry()
+    status = registry.status()
+    st.markdown(f"**Model:** {status['active']}" + (" (pinned)" if status['pinned'] == status['active'] else ""))
+    st.caption(f"Previous: {status['previous'] or '—'} · available: {len(status['available'])}")
+    if status['last_error']:
+        st.warning(f"Last load failed: {status['last_error']}")
+    if st.button("↩️ Roll back", disabled=status['previous'] is None):
+        try:
+            st.success(f"Rolled back to {registry.rollback()}")
+        except ValueError as exc:
+            st.warning(str(exc))
+
 # Sidebar additional info
 with st.sidebar:
     st.markdown("---")
@@ -656,9 +816,17 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("## 📊 Quick Stats")
+    disease_stats = get_disease_stats()
     st.info(f"**Total Diseases:** {len(disease_stats)}")
     st.info(f"**Most Common:** {disease_stats.iloc[0]['Disease']}")
     st.info(f"**Latest Update:** Today")
+    
+    if ADMIN_TOKEN:
+        with st.expander("🔐 Admin"):
+            admin_token = st.text_input("Admin token", type="password")
+            if admin_token and hmac.compare_digest(admin_token.encode(), ADMIN_TOKEN.encode()):
+                model_panel()
+                metrics_panel()
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,36 @@
+"""Atomic file replacement.
+
+A file is written to a uniquely named staging file in the target's directory and renamed over
+the target, so readers see either the old file or the complete new one, and two writers never
+share a staging file. Staging names start with ".tmp-", so directory scans can skip them.
+"""
+import os
+import tempfile
+
+# Read once at import: os.umask() can only be read by setting it, which isn't thread safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, write):
+    # Calls write(staging_path), then renames the staging file onto path; on any failure the
+    # staging file is removed and path is left as it was. The directory must exist.
+    fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        # mkstemp creates the file private (0600); give it a normal file's permissions
+        os.chmod(staging, 0o666 & ~_UMASK)
+        write(staging)
+        os.replace(staging, path)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+    return path
+
+
+def atomic_write_text(path, text):
+    def write(staging):
+        with open(staging, "w", encoding="utf-8") as handle:
+            handle.write(text)
+
+    return atomic_write(path, write)
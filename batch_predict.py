@@ -0,0 +1,250 @@
+"""Headless batch scoring of CSV or JSONL records.
+
+Examples:
+    python batch_predict.py intake.csv -o predictions.csv
+    cat intake.jsonl | python batch_predict.py - --format jsonl --chunk-size 50000
+    python batch_predict.py intake.csv -o predictions.csv --workers 8
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from itertools import chain, islice
+
+import compiled_model
+from parallel_scoring import ParallelScorer
+from prediction_cache import PredictionCache, predict_cached
+from predictor import MODEL_PATH, format_load_stats, load_model, predict_topk, topk_rows
+
+
+class InputError(ValueError):
+    pass
+
+
+def read_records(stream, fmt, column=None):
+    # Records are yielded lazily so only one chunk is ever held in memory. A CSV header without
+    # `column` fails before any record is read; JSONL lines that aren't JSON objects are skipped
+    # with a warning naming the line.
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if column is not None and column not in (reader.fieldnames or []):
+            raise InputError(f"Input has no '{column}' column (columns: {', '.join(reader.fieldnames or [])})")
+        for record in reader:
+            yield record
+    else:
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                print(f"Skipping line {number}: invalid JSON ({exc})", file=sys.stderr)
+                continue
+            if not isinstance(record, dict):
+                print(f"Skipping line {number}: expected a JSON object", file=sys.stderr)
+                continue
+            yield record
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RecordWriter:
+    def __init__(self, stream, fmt, prediction_column, top_k=1):
+        self.stream = stream
+        self.fmt = fmt
+        self.prediction_column = prediction_column
+        self.top_k = top_k
+        self._csv_writer = None
+
+    def output_columns(self):
+        return [self.prediction_column, "Confidence"] + (["Top_K"] if self.top_k > 1 else [])
+
+    def write_chunk(self, records, rankings):
+        # rankings holds the [(label, score), ...] top-k list of every record, or None for a
+        # record without symptom text, which is written unscored
+        for record, ranking in zip(records, rankings):
+            if ranking is None:
+                record.update(dict.fromkeys(self.output_columns()))
+                continue
+            record[self.prediction_column], record["Confidence"] = ranking[0]
+            if self.top_k > 1:
+                top_k = [{"disease": label, "score": score} for label, score in ranking]
+                record["Top_K"] = json.dumps(top_k) if self.fmt == "csv" else top_k
+        if self.fmt == "csv":
+            if self._csv_writer is None:
+                # The columns are fixed by the first record; JSONL fields that only appear later
+                # are left out and missing ones are written empty, rather than failing mid-file
+                columns = [key for key in records[0] if key not in self.output_columns()]
+                self._csv_writer = csv.DictWriter(self.stream, fieldnames=columns + self.output_columns(),
+                                                  extrasaction="ignore")
+                self._csv_writer.writeheader()
+            self._csv_writer.writerows(records)
+        else:
+            self.stream.write("".join(json.dumps(record) + "\n" for record in records))
+        self.stream.flush()
+
+
+def chunk_texts(chunk, column):
+    # Symptom text of every record, None where it is empty or missing
+    texts = []
+    for record in chunk:
+        text = record.get(column)
+        texts.append(str(text) if text is not None and str(text).strip() else None)
+    return texts
+
+
+def present(texts):
+    return [text for text in texts if text is not None]
+
+
+def with_blanks(texts, rankings):
+    # Re-aligns rankings of present(texts) with texts, None for the empty ones
+    rankings = iter(rankings)
+    return [None if text is None else next(rankings) for text in texts]
+
+
+def score_stream(model, records, writer, column="Symptoms", chunk_size=10000, progress=None, top_k=1,
+                 scorer=None, cache=None):
+    # With a ParallelScorer, chunks are scored in worker processes and written back in input order.
+    # With a PredictionCache (in-process scoring only), each chunk sends just the symptom sets
+    # not seen before through the model.
+    total = 0
+    start = time.perf_counter()
+    chunks = chunked(records, chunk_size)
+
+    def rank(model, texts):
+        # Labels and confidences come out of the same model pass
+        return topk_rows(predict_topk(model, texts, top_k))
+
+    if scorer is None:
+        if cache is None:
+            scored = ((chunk, rank(model, present(chunk_texts(chunk, column)))) for chunk in chunks)
+        else:
+            scored = ((chunk, predict_cached(cache, model, present(chunk_texts(chunk, column)), id(model), rank))
+                      for chunk in chunks)
+    else:
+        scored = scorer.imap(chunks, lambda chunk: present(chunk_texts(chunk, column)))
+    for chunk, rankings in scored:
+        writer.write_chunk(chunk, with_blanks(chunk_texts(chunk, column), rankings))
+        total += len(chunk)
+        if progress:
+            progress(total, time.perf_counter() - start)
+    return total, time.perf_counter() - start
+
+
+def detect_format(path, fmt):
+    if fmt:
+        return fmt
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def open_input(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def open_output(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Stream CSV/JSONL records through the disease predictor.")
+    parser.add_argument("input", help="input file, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, or '-' for stdout (default)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from extension, else csv)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="output format (default: same as input)")
+    parser.add_argument("--column", default="Symptoms", help="field holding the symptom text (default: Symptoms)")
+    parser.add_argument("--prediction-column", default="Prediction", help="field written with the result")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="records per model call (default: 10000)")
+    parser.add_argument("--top-k", type=int, default=1, help="also write the k best-ranked diseases (default: 1)")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the joblib model")
+    parser.add_argument("--compiled", action="store_true", help="answer known symptom sets from a lookup table")
+    parser.add_argument("--max-subset-size", type=int, default=0,
+                        help="with --compiled, also tabulate all subsets up to this size")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="score chunks in this many processes, each loading the model once (default: 1)")
+    parser.add_argument("--cache-size", type=int, default=65536,
+                        help="distinct symptom sets to remember between chunks, 0 to score every row "
+                             "(in-process scoring only; default: 65536)")
+    parser.add_argument("--progress", action="store_true", help="report throughput after every chunk")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.chunk_size < 1:
+        raise SystemExit("--chunk-size must be positive")
+    if args.top_k < 1:
+        raise SystemExit("--top-k must be positive")
+    if args.workers < 1:
+        raise SystemExit("--workers must be positive")
+
+    in_format = detect_format(args.input, args.format)
+    out_format = args.output_format or in_format
+
+    model, scorer, cache = None, None, None
+    if args.workers > 1:
+        scorer = ParallelScorer(args.workers, args.model, top_k=args.top_k, compiled=args.compiled,
+                                max_subset_size=args.max_subset_size)
+    else:
+        model = load_model(args.model)
+        print(format_load_stats(), file=sys.stderr)
+        if args.compiled:
+            model = compiled_model.compile_model(model, args.max_subset_size)
+        if args.cache_size > 0:
+            cache = PredictionCache(args.cache_size)
+
+    def report(rows, elapsed):
+        rate = rows / elapsed if elapsed else 0.0
+        print(f"{rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+
+    with open_input(args.input) as src:
+        records = read_records(src, in_format, args.column)
+        try:
+            # Reads the CSV header before the output file is created
+            first = next(records, None)
+        except InputError as exc:
+            if scorer is not None:
+                scorer.close()
+            raise SystemExit(f"{args.input}: {exc}")
+        with open_output(args.output) as dst:
+            writer = RecordWriter(dst, out_format, args.prediction_column, top_k=args.top_k)
+            rows, elapsed = score_stream(
+                model,
+                chain([first], records) if first is not None else records,
+                writer,
+                column=args.column,
+                chunk_size=args.chunk_size,
+                progress=report if args.progress else None,
+                top_k=args.top_k,
+                scorer=scorer,
+                cache=cache,
+            )
+    report(rows, elapsed)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"prediction cache: {stats['hits']:,} hits, {stats['misses']:,} misses", file=sys.stderr)
+    if scorer is not None:
+        scorer.close()
+        for worker in scorer.report():
+            print(f"worker {worker['pid']}: {worker['rows']:,} rows, {worker['rows_per_second'] or 0:,.0f} rows/s",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Reproducible benchmarks for model loading, dataset generation, inference and page renders.
+
+    python benchmark.py --output bench.json                 # run and write results
+    python benchmark.py --save-baseline                     # record benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json  # compare, exit 1 on regressions
+
+Results are a flat JSON object of metric name -> {"value", "unit", "better"}.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import dataset
+import predictor
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DATASET_SIZES = [10000, 100000, dataset.NUM_ROWS]
+PAGES = ["🏠 Home", "📊 Analytics", "📈 Statistics", "📋 Dataset", "👥 Our Team", "📞 Contact"]
+
+# Run in a fresh interpreter so imports and the file read are part of the cold start
+_LOAD_SNIPPET = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+import predictor
+predictor.load_model({path!r})
+stats = dict(predictor.LOAD_STATS)
+stats["cold_start_seconds"] = time.perf_counter() - start
+print(json.dumps(stats))
+"""
+
+
+def metric(value, unit, better="lower"):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def timed(func, repeat):
+    # Median wall time over `repeat` runs
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_load_model(model_path, repeat):
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _LOAD_SNIPPET.format(path=model_path)],
+            check=True, capture_output=True, text=True, cwd=os.path.dirname(APP_PATH),
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "load_model.seconds": metric(statistics.median(r["seconds"] for r in runs), "s"),
+        "load_model.cold_start_seconds": metric(statistics.median(r["cold_start_seconds"] for r in runs), "s"),
+        "load_model.rss_delta_mib": metric(statistics.median(r["rss_delta_bytes"] for r in runs) / 2**20, "MiB"),
+    }
+
+
+def bench_generate_dataset(sizes, repeat):
+    results = {}
+    for size in sizes:
+        seconds = timed(lambda: dataset.generate_dataset(num_rows=size), repeat)
+        tracemalloc.start()
+        dataset.generate_dataset(num_rows=size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"generate_dataset.{size}.seconds"] = metric(seconds, "s")
+        results[f"generate_dataset.{size}.peak_mib"] = metric(peak / 2**20, "MiB")
+    return results
+
+
+def bench_predict(model_path, repeat, single_count=500, batch_size=10000):
+    model = predictor.load_model(model_path)
+    df = dataset.generate_dataset(num_rows=batch_size)[0]
+    texts = dataset.to_display_frame(df)["Symptoms"].tolist()
+    try:
+        model.predict(texts[:1])
+    except Exception as exc:
+        # An artifact that does not take symptom text cannot be benchmarked here
+        print(f"Skipping predict benchmarks: {exc}", file=sys.stderr)
+        return {}
+
+    single = timed(lambda: [model.predict([text]) for text in texts[:single_count]], repeat)
+    batched = timed(lambda: model.predict(texts), repeat)
+    topk = timed(lambda: predictor.predict_topk(model, texts, 3), repeat)
+    return {
+        "predict.single.latency_ms": metric(single / single_count * 1000, "ms"),
+        "predict.single.rows_per_second": metric(single_count / single, "rows/s", "higher"),
+        "predict.batch.rows_per_second": metric(batch_size / batched, "rows/s", "higher"),
+        "predict_topk.batch.rows_per_second": metric(batch_size / topk, "rows/s", "higher"),
+    }
+
+
+def bench_pages(repeat, timeout=120):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    start = time.perf_counter()
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    results["app.first_run_seconds"] = metric(time.perf_counter() - start, "s")
+    for page in PAGES:
+        name = page.split(" ", 1)[1].lower().replace(" ", "_")
+
+        def render():
+            app.sidebar.selectbox[0].select(page).run()
+            if app.exception:
+                raise RuntimeError(f"{page} raised: {app.exception[0].value}")
+
+        render()  # warm-up so every page is measured with its caches populated
+        results[f"page.{name}.seconds"] = metric(timed(render, repeat), "s")
+    return results
+
+
+def run(model_path=predictor.MODEL_PATH, repeat=3, sizes=DATASET_SIZES, pages=True):
+    results = {}
+    results.update(bench_load_model(model_path, repeat))
+    results.update(bench_generate_dataset(sizes, repeat))
+    results.update(bench_predict(model_path, repeat))
+    if pages:
+        results.update(bench_pages(repeat))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Returns (report lines, regressions); a metric regresses when it is worse by more than tolerance
+    lines, regressions = [], []
+    for name, current in sorted(results.items()):
+        if name not in baseline:
+            lines.append(f"{name:45} {current['value']:>12.4f} {current['unit']:7} (new)")
+            continue
+        old = baseline[name]["value"]
+        ratio = current["value"] / old if old else float("inf")
+        worse = ratio > 1 + tolerance if current["better"] == "lower" else ratio < 1 / (1 + tolerance)
+        flag = "REGRESSION" if worse else ""
+        lines.append(f"{name:45} {current['value']:>12.4f} {current['unit']:7} x{ratio:6.2f} {flag}")
+        if worse:
+            regressions.append(name)
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load, generation, inference and page renders.")
+    parser.add_argument("--model", default=predictor.MODEL_PATH,
+                        help="model for the load/predict benchmarks (pages use DISEASE_MODEL_PATH)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is kept)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DATASET_SIZES, help="dataset sizes to generate")
+    parser.add_argument("--no-pages", action="store_true", help="skip the Streamlit AppTest page renders")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write {os.path.basename(BASELINE_PATH)}")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    results = run(args.model, args.repeat, args.sizes, pages=not args.no_pages)
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "model": os.path.basename(args.model),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+        lines, regressions = compare(results, baseline, args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Lookup-table ("compiled") inference for the finite symptom space.
+
+The pipeline's scores are precomputed for every symptom subset seen in the dataset (and
+optionally every subset up to a size limit) and stored in a table keyed by symptom bitmask.
+Queries made only of known symptoms are answered by lookup; anything else falls back to the
+pipeline. CompiledModel exposes classes_, predict and predict_proba/decision_function, so it
+drops in wherever the joblib model is used.
+
+    python compiled_model.py --max-subset-size 3 --verify
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+import dataset
+import predictor
+from symptom_index import normalize, split_tokens
+
+# Set DISEASE_MODEL_COMPILED=1 to serve the app from the compiled table
+ENABLED = os.environ.get("DISEASE_MODEL_COMPILED", "") == "1"
+
+
+def subset_masks(vocabulary, max_size):
+    # Every non-empty subset of at most max_size symptoms, as bitmasks
+    masks = []
+    for size in range(1, max_size + 1):
+        for combo in combinations(range(len(vocabulary)), size):
+            masks.append(sum(1 << bit for bit in combo))
+    return np.array(masks, dtype=dataset.mask_dtype(vocabulary))
+
+
+class CompiledModel:
+    def __init__(self, model, masks, scores, kind, classes, vocabulary):
+        self.model = model
+        self.masks = masks
+        self.scores = scores
+        self.kind = kind
+        self.classes_ = classes
+        self.vocabulary = vocabulary
+        self._bits = {normalize(s): 1 << bit for bit, s in enumerate(vocabulary)}
+        self._rows = {int(mask): row for row, mask in enumerate(masks)}
+        # Gateway workers score concurrently, so the counters are only touched under the lock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+        # Real traffic repeats the same strings, so parsing is memoized per text
+        self.encode = lru_cache(maxsize=65536)(self._encode)
+
+    @classmethod
+    def compile(cls, model, masks, vocabulary=None, batch_size=4096):
+        # Runs the pipeline once per distinct mask on its canonical text
+        vocabulary = vocabulary or dataset.symptom_vocabulary()
+        masks = np.unique(np.asarray(masks, dtype=dataset.mask_dtype(vocabulary)))
+        masks = masks[masks != 0]
+        if not len(masks):
+            raise ValueError("No symptom subsets to compile")
+        method, kind = predictor.score_method(model)
+        if kind is None:
+            raise ValueError("Compiled inference needs a classifier with predict_proba or decision_function")
+        texts = mask_texts(masks, vocabulary)
+        scores = np.vstack([
+            np.asarray(getattr(model, method)(texts[i:i + batch_size]), dtype=np.float32).reshape(
+                min(batch_size, len(texts) - i), -1)
+            for i in range(0, len(texts), batch_size)
+        ])
+        return cls(model, masks, scores, kind, np.asarray(model.classes_), vocabulary)
+
+    def _encode(self, text):
+        # Bitmask of text made only of vocabulary symptoms, otherwise None
+        mask = 0
+        for token in split_tokens(text):
+            bit = self._bits.get(normalize(token))
+            if bit is None:
+                return None
+            mask |= bit
+        return mask or None
+
+    def _scores(self, texts):
+        texts = list(texts)
+        rows = []
+        for text in texts:
+            mask = self.encode(text)
+            rows.append(self._rows.get(mask) if mask is not None else None)
+        missing = [i for i, row in enumerate(rows) if row is None]
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.fallbacks += len(missing)
+
+        found = [row if row is not None else 0 for row in rows]
+        scores = self.scores[found].astype(np.float64)
+        if missing:
+            method, _ = predictor.score_method(self.model)
+            fresh = np.asarray(getattr(self.model, method)([texts[i] for i in missing]), dtype=np.float64)
+            scores[missing] = fresh.reshape(len(missing), -1)
+        return scores
+
+    @property
+    def predict_proba(self):
+        # Only offered when the table holds probabilities, mirroring sklearn's available_if
+        if self.kind != "probability":
+            raise AttributeError("predict_proba")
+        return self._scores
+
+    @property
+    def decision_function(self):
+        if self.kind != "decision":
+            raise AttributeError("decision_function")
+        return self._scores
+
+    def predict(self, texts):
+        scores = self._scores(texts)
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+    def stats(self):
+        with self._lock:
+            hits, fallbacks = self.hits, self.fallbacks
+        return {"entries": len(self.masks), "hits": hits, "fallbacks": fallbacks,
+                "table_bytes": int(self.masks.nbytes + self.scores.nbytes)}
+
+    def verify(self, texts=None, atol=1e-5):
+        # Recomputes every table entry (and optionally extra query texts) with the pipeline and
+        # reports disagreements in the predicted label or in the scores beyond float32 precision
+        method, _ = predictor.score_method(self.model)
+        table_texts = mask_texts(self.masks, self.vocabulary)
+        expected = np.asarray(getattr(self.model, method)(table_texts), dtype=np.float64).reshape(len(table_texts), -1)
+        report = _compare(table_texts, self.scores.astype(np.float64), expected, atol)
+        if texts is not None:
+            texts = list(texts)
+            looked_up = self._scores(texts)
+            expected = np.asarray(getattr(self.model, method)(texts), dtype=np.float64).reshape(len(texts), -1)
+            report["queries"] = _compare(texts, looked_up, expected, atol)
+        return report
+
+
+def mask_texts(masks, vocabulary):
+    # Canonical model input for each mask: sorted symptom names, as prediction_cache builds them
+    return [", ".join(sorted(s for bit, s in enumerate(vocabulary) if int(mask) >> bit & 1)) for mask in masks]
+
+
+def _compare(texts, actual, expected, atol):
+    label_mismatch = actual.argmax(axis=1) != expected.argmax(axis=1)
+    score_mismatch = ~np.isclose(actual, expected, atol=atol).all(axis=1)
+    bad = np.flatnonzero(label_mismatch | score_mismatch)
+    return {
+        "checked": len(texts),
+        "label_mismatches": int(label_mismatch.sum()),
+        "score_mismatches": int(score_mismatch.sum()),
+        "max_abs_error": float(np.abs(actual - expected).max()) if len(texts) else 0.0,
+        "examples": [texts[i] for i in bad[:5]],
+        "ok": not len(bad),
+    }
+
+
+def compile_model(model, max_subset_size=0, vocabulary=None):
+    # Table over the dataset's symptom subsets plus, optionally, all subsets up to max_subset_size
+    vocabulary = vocabulary or dataset.symptom_vocabulary()
+    masks = dataset.load_product("df")["Symptom_Mask"].to_numpy()
+    if max_subset_size:
+        masks = np.concatenate([masks, subset_masks(vocabulary, max_subset_size)])
+    return CompiledModel.compile(model, masks, vocabulary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute a lookup table of pipeline outputs.")
+    parser.add_argument("--model", default=predictor.MODEL_PATH, help="path to the joblib model")
+    parser.add_argument("--max-subset-size", type=int, default=0,
+                        help="also tabulate every subset of up to this many symptoms")
+    parser.add_argument("--verify", action="store_true", help="check every entry against the pipeline")
+    args = parser.parse_args(argv)
+
+    model = predictor.load_model(args.model)
+    start = time.perf_counter()
+    compiled = compile_model(model, args.max_subset_size)
+    stats = compiled.stats()
+    print(f"Compiled {stats['entries']:,} subsets ({stats['table_bytes'] / 1024:.1f} KiB) "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    if args.verify:
+        df = dataset.load_product("df")
+        sample = dataset.to_display_frame(df.head(10000))["Symptoms"].tolist()
+        report = compiled.verify(sample)
+        print(report, file=sys.stderr)
+        if not (report["ok"] and report["queries"]["ok"]):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
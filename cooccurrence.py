@@ -0,0 +1,74 @@
+"""Symptom co-occurrence counts and P(disease | symptom) from the compact dataset.
+
+Records are first collapsed to distinct (disease, symptom mask) pairs with their counts, then
+both tables come out of weighted sparse one-hot products: Xᵀ·W·X for symptom pairs and Xᵀ·W·D
+for symptom/disease pairs. Cost after the collapse depends on the number of distinct symptom
+sets, not on the number of rows.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import dataset
+
+
+def _distinct_records(df):
+    # (disease codes, masks, counts) of every distinct (disease, mask) pair
+    codes = df["Disease"].cat.codes.to_numpy().astype(np.uint64)
+    masks = df["Symptom_Mask"].to_numpy().astype(np.uint64)
+    keys, counts = np.unique((codes << np.uint64(32)) | masks, return_counts=True)
+    return (keys >> np.uint64(32)).astype(np.int64), keys & np.uint64(0xFFFFFFFF), counts
+
+
+def _symptom_matrix(masks, vocabulary):
+    # Sparse one-hot rows x symptoms
+    bits = np.uint64(1) << np.arange(len(vocabulary), dtype=np.uint64)
+    rows, columns = np.nonzero((masks[:, None] & bits[None, :]) != 0)
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(masks), len(vocabulary)))
+
+
+def build_tables(df, vocabulary=None):
+    # Returns (cooccurrence, disease_given_symptom) as long frames
+    vocabulary = vocabulary or dataset.symptom_vocabulary()
+    if len(vocabulary) > 32:
+        raise ValueError("Co-occurrence tables support at most 32 symptoms")
+    diseases = list(df["Disease"].cat.categories)
+    codes, masks, counts = _distinct_records(df)
+
+    symptoms = _symptom_matrix(masks, vocabulary)
+    weights = sparse.diags(counts.astype(np.float64))
+    disease_onehot = sparse.csr_matrix(
+        (np.ones(len(codes)), (np.arange(len(codes)), codes)), shape=(len(codes), len(diseases))
+    )
+    pairs = (symptoms.T @ weights @ symptoms).toarray().astype(np.int64)
+    by_disease = (symptoms.T @ weights @ disease_onehot).toarray().astype(np.int64)
+
+    # Diagonal = records with the symptom
+    cooccurrence = pd.DataFrame({
+        "Symptom_A": np.repeat(vocabulary, len(vocabulary)),
+        "Symptom_B": np.tile(vocabulary, len(vocabulary)),
+        "Count": pairs.ravel(),
+    })
+
+    totals = np.diag(pairs)
+    probability = np.divide(by_disease, totals[:, None], out=np.zeros(by_disease.shape), where=totals[:, None] > 0)
+    disease_given_symptom = pd.DataFrame({
+        "Symptom": np.repeat(vocabulary, len(diseases)),
+        "Disease": np.tile(diseases, len(vocabulary)),
+        "Cases": by_disease.ravel(),
+        "Probability": probability.ravel().round(4),
+    })
+    disease_given_symptom = disease_given_symptom[disease_given_symptom["Cases"] > 0].reset_index(drop=True)
+    return cooccurrence, disease_given_symptom
+
+
+def cooccurrence_matrix(cooccurrence):
+    # Square symptoms x symptoms frame from the long table, in vocabulary order
+    order = list(dict.fromkeys(cooccurrence["Symptom_A"]))
+    return cooccurrence.pivot(index="Symptom_A", columns="Symptom_B", values="Count").loc[order, order]
+
+
+def disease_probabilities(disease_given_symptom, symptom):
+    # P(disease | symptom) for one symptom, most likely first
+    rows = disease_given_symptom[disease_given_symptom["Symptom"] == symptom]
+    return rows.drop(columns="Symptom").sort_values("Probability", ascending=False).reset_index(drop=True)
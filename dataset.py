@@ -0,0 +1,542 @@
+"""Synthetic symptom/disease dataset and the aggregate frames the app renders.
+
+    python dataset.py --check-parity                  # compare the NumPy generator with the legacy loop
+    python dataset.py --warm-cache                    # build the on-disk Feather cache before starting the app
+    python dataset.py --warm-cache --rows 20000000    # streamed to disk in CHUNK_SIZE chunks
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import instrumentation
+from atomic import atomic_write
+
+DISEASE_SYMPTOMS = {
+    "Common Cold": ["fever", "cough", "sore throat", "runny nose", "sneezing"],
+    "Flu": ["fever", "cough", "headache", "muscle pain", "fatigue", "chills"],
+    "Bronchitis": ["cough", "shortness of breath", "chest pain", "fatigue", "sore throat"],
+    "Dengue": ["fever", "headache", "joint pain", "rash", "nausea", "vomiting"],
+    "Malaria": ["fever", "chills", "sweating", "headache", "muscle pain"],
+    "Tuberculosis": ["fever", "cough", "night sweats", "weight loss", "fatigue"],
+    "Gastroenteritis": ["diarrhea", "abdominal pain", "fever", "nausea", "vomiting"],
+    "Allergy": ["itching", "rash", "redness", "swelling", "sneezing"],
+    "Diabetes": ["fatigue", "weight loss", "blurred vision", "increased thirst"],
+    "COVID-19": ["fever", "cough", "loss of taste", "shortness of breath", "fatigue"],
+}
+
+# Add severity and recovery days (simulated for demo)
+SEVERITY_MAP = {
+    'Common Cold': 'Low', 'Flu': 'Medium', 'Bronchitis': 'Medium',
+    'Dengue': 'High', 'Malaria': 'High', 'Tuberculosis': 'High',
+    'Gastroenteritis': 'Medium', 'Allergy': 'Low', 'Diabetes': 'High',
+    'COVID-19': 'High'
+}
+
+RECOVERY_MAP = {
+    'Common Cold': 7, 'Flu': 10, 'Bronchitis': 14,
+    'Dengue': 21, 'Malaria': 28, 'Tuberculosis': 180,
+    'Gastroenteritis': 5, 'Allergy': 3, 'Diabetes': 365,
+    'COVID-19': 14
+}
+
+# Dataset size for the app; override with DISEASE_DATASET_ROWS for load testing
+NUM_ROWS = int(os.environ.get("DISEASE_DATASET_ROWS", "") or 159874)
+SEED = 42
+
+# Rows generated per step. Peak memory while generating is bounded by this, not by NUM_ROWS.
+CHUNK_SIZE = int(os.environ.get("DISEASE_DATASET_CHUNK_SIZE", "") or 250000)
+
+# On-disk cache shared by every process/replica on the host
+CACHE_DIR = os.environ.get(
+    "DISEASE_DATA_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "dataset"),
+)
+# Bump when the generator or the cached layout changes so old entries are ignored
+CACHE_VERSION = 2
+CACHE_MAX_ENTRIES = 4
+
+
+def symptom_vocabulary(disease_symptoms=DISEASE_SYMPTOMS):
+    # Every known symptom, in order of first appearance
+    return list(dict.fromkeys(s for symptoms in disease_symptoms.values() for s in symptoms))
+
+
+def build_monthly_data():
+    # Monthly data (simulated)
+    return pd.DataFrame({
+        'Month': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        'Predictions': [1250, 1180, 1420, 1680, 1890, 2100, 2300, 2150, 1980, 1750, 1600, 1400],
+        'Accuracy': [94.2, 95.1, 93.8, 96.2, 95.7, 96.8, 97.1, 96.5, 95.9, 96.3, 95.8, 96.0]
+    })
+
+
+def build_disease_stats(disease_counts, total_rows):
+    # Disease distribution from a {disease: cases} mapping, most common first
+    disease_stats = pd.DataFrame(list(disease_counts.items()), columns=['Disease', 'Cases'])
+    disease_stats = disease_stats.sort_values('Cases', ascending=False, kind='stable').reset_index(drop=True)
+    disease_stats['Percentage'] = (disease_stats['Cases'] / total_rows * 100).round(2)
+    disease_stats['Severity'] = disease_stats['Disease'].map(SEVERITY_MAP)
+    disease_stats['Recovery_Days'] = disease_stats['Disease'].map(RECOVERY_MAP)
+    return disease_stats
+
+
+def build_symptom_freq(symptom_counts):
+    # Symptom frequency from a {symptom: occurrences} mapping, most frequent first
+    total = sum(symptom_counts.values())
+    symptom_freq_df = pd.DataFrame(list(symptom_counts.items()), columns=['Symptom', 'Frequency'])
+    symptom_freq_df = symptom_freq_df[symptom_freq_df['Frequency'] > 0]
+    symptom_freq_df = symptom_freq_df.sort_values('Frequency', ascending=False, kind='stable').reset_index(drop=True)
+    symptom_freq_df['Percentage'] = (symptom_freq_df['Frequency'] / total * 100).round(2)
+    return symptom_freq_df
+
+
+def build_symptoms_per_disease(df):
+    # Symptoms per disease stats
+    symptoms_per_disease = df.groupby('Disease', observed=True)['Symptom_Count'].agg(['mean', 'min', 'max', 'std']).round(2)
+    symptoms_per_disease = symptoms_per_disease.reset_index()
+    # Categorical groups follow category order; keep the alphabetical order of the string version
+    symptoms_per_disease['Disease'] = symptoms_per_disease['Disease'].astype(str)
+    return symptoms_per_disease.sort_values('Disease').reset_index(drop=True)
+
+
+def mask_dtype(vocabulary):
+    if len(vocabulary) <= 32:
+        return np.uint32
+    if len(vocabulary) <= 64:
+        return np.uint64
+    raise ValueError(f"Symptom bitmasks support at most 64 symptoms, got {len(vocabulary)}")
+
+
+def popcount(masks):
+    # Number of set bits per mask
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks)
+    bits = np.unpackbits(np.ascontiguousarray(masks).view(np.uint8).reshape(len(masks), -1), axis=1)
+    return bits.sum(axis=1)
+
+
+def symptom_bit_counts(masks, vocabulary):
+    # Occurrences of each vocabulary symptom, one pass per bit
+    return np.array([
+        np.count_nonzero(masks & masks.dtype.type(1 << bit)) for bit in range(len(vocabulary))
+    ], dtype=np.int64)
+
+
+def encode_symptom_lists(symptom_lists, vocabulary):
+    # Bitmask per row from lists of symptom names (names outside the vocabulary are ignored)
+    index = {s: i for i, s in enumerate(vocabulary)}
+    dtype = mask_dtype(vocabulary)
+    masks = np.zeros(len(symptom_lists), dtype=dtype)
+    for row, symptoms in enumerate(symptom_lists):
+        mask = 0
+        for symptom in symptoms:
+            if symptom in index:
+                mask |= 1 << index[symptom]
+        masks[row] = mask
+    return masks
+
+
+def symptom_labels(masks, vocabulary=None):
+    # "a, b, c" text for each mask, joined once per distinct mask and in vocabulary order
+    vocabulary = vocabulary or symptom_vocabulary()
+    masks = np.asarray(masks)
+    unique_masks, inverse = np.unique(masks, return_inverse=True)
+    labels = np.array([
+        ", ".join(s for bit, s in enumerate(vocabulary) if int(mask) >> bit & 1) for mask in unique_masks
+    ], dtype=object)
+    return labels[inverse.reshape(-1)]
+
+
+def to_display_frame(df, vocabulary=None):
+    # Materializes the symptom text for display or CSV export; call on the slice you need
+    return pd.DataFrame({
+        "Symptoms": symptom_labels(df["Symptom_Mask"].to_numpy(), vocabulary),
+        "Disease": df["Disease"].astype(str).to_numpy(),
+        "Symptom_Count": df["Symptom_Count"].to_numpy(),
+    }, index=df.index)
+
+
+def compact_frame(disease_idx, masks, diseases):
+    # One row per record: symptom bitmask, categorical disease and the bit count
+    return pd.DataFrame({
+        "Symptom_Mask": masks,
+        "Disease": pd.Categorical.from_codes(disease_idx.astype(np.int8), categories=diseases),
+        "Symptom_Count": popcount(masks).astype(np.uint8),
+    })
+
+
+def build_aggregates(df, vocabulary):
+    # disease_stats, symptom_freq_df and symptoms_per_disease from the compact frame's bits,
+    # through the same incremental engine that absorbs appended batches
+    from aggregates import AggregationEngine
+
+    return AggregationEngine.from_frame(df, vocabulary).frames()
+
+
+def generate_dataset_legacy(num_rows=NUM_ROWS, seed=SEED, disease_symptoms=DISEASE_SYMPTOMS):
+    # Original pure-Python generator; reproduces the historical dataset row for row.
+    # Aggregates are still computed from the strings so it doubles as a reference implementation.
+    random.seed(seed)
+    rows = []
+
+    for _ in range(num_rows):
+        disease = random.choice(list(disease_symptoms.keys()))
+        symptoms_list = disease_symptoms[disease]
+        symptom_count = random.randint(2, len(symptoms_list))
+        symptoms = random.sample(symptoms_list, symptom_count)
+        symptom_str = ", ".join(symptoms)
+        rows.append([symptom_str, disease])
+
+    df = pd.DataFrame(rows, columns=["Symptoms", "Disease"])
+    df['Symptom_Count'] = df['Symptoms'].apply(lambda x: len(x.split(',')))
+
+    # Extract all symptoms for analysis
+    all_symptoms = []
+    for symptoms_str in df['Symptoms']:
+        symptoms = [s.strip() for s in symptoms_str.split(',')]
+        all_symptoms.extend(symptoms)
+
+    disease_stats = build_disease_stats(df['Disease'].value_counts().to_dict(), len(df))
+    symptom_freq_df = build_symptom_freq(Counter(all_symptoms))
+    symptoms_per_disease = build_symptoms_per_disease(df)
+
+    diseases = list(disease_symptoms)
+    vocabulary = symptom_vocabulary(disease_symptoms)
+    masks = encode_symptom_lists([[s.strip() for s in text.split(',')] for text in df['Symptoms']], vocabulary)
+    disease_idx = df['Disease'].map({d: i for i, d in enumerate(diseases)}).to_numpy()
+    df = compact_frame(disease_idx, masks, diseases)
+
+    return df, disease_stats, symptom_freq_df, build_monthly_data(), symptoms_per_disease
+
+
+def sample_symptom_masks(num_rows, seed=SEED, disease_symptoms=DISEASE_SYMPTOMS, rng=None):
+    # Draws diseases and symptom subsets in bulk with a seeded Generator (or `rng`, to continue
+    # an existing stream). Returns (disease index per row, symptom bitmask per row).
+    rng = rng or np.random.default_rng(seed)
+    vocabulary = symptom_vocabulary(disease_symptoms)
+    vocab = {s: i for i, s in enumerate(vocabulary)}
+    lists = list(disease_symptoms.values())
+    width = max(len(symptoms) for symptoms in lists)
+
+    # Disease x position -> symptom id, -1 past the end of a disease's list
+    table = np.full((len(lists), width), -1, dtype=np.int16)
+    for d, symptoms in enumerate(lists):
+        table[d, :len(symptoms)] = [vocab[s] for s in symptoms]
+    lengths = np.array([len(symptoms) for symptoms in lists])
+
+    disease_idx = rng.integers(0, len(lists), size=num_rows)
+    counts = rng.integers(2, lengths[disease_idx] + 1)
+
+    # Shuffle the valid positions of every row at once: random keys, padding sorted last
+    keys = rng.random((num_rows, width))
+    keys[table[disease_idx] < 0] = np.inf
+    order = np.argsort(keys, axis=1)
+    symptom_ids = np.take_along_axis(table[disease_idx], order, axis=1)
+    symptom_ids[np.arange(width) >= counts[:, None]] = -1
+
+    dtype = mask_dtype(vocabulary)
+    bits = np.where(symptom_ids >= 0, np.left_shift(dtype(1), symptom_ids.clip(0).astype(dtype)), dtype(0))
+    return disease_idx, np.bitwise_or.reduce(bits, axis=1)
+
+
+def iter_chunks(num_rows=NUM_ROWS, seed=SEED, disease_symptoms=DISEASE_SYMPTOMS, chunk_size=CHUNK_SIZE):
+    # Compact frames of at most chunk_size rows, drawn from one seeded stream. A dataset that fits
+    # in a single chunk is identical to sampling it in one go.
+    rng = np.random.default_rng(seed)
+    diseases = list(disease_symptoms)
+    for start in range(0, num_rows, chunk_size):
+        size = min(chunk_size, num_rows - start)
+        disease_idx, masks = sample_symptom_masks(size, disease_symptoms=disease_symptoms, rng=rng)
+        yield compact_frame(disease_idx, masks, diseases)
+
+
+def _aggregation_engine(disease_symptoms):
+    from aggregates import AggregationEngine
+
+    return AggregationEngine(list(disease_symptoms), symptom_vocabulary(disease_symptoms))
+
+
+def generate_dataset_numpy(num_rows=NUM_ROWS, seed=SEED, disease_symptoms=DISEASE_SYMPTOMS, chunk_size=CHUNK_SIZE):
+    # Counts and frequencies come straight from the bitmasks, accumulated chunk by chunk
+    engine = _aggregation_engine(disease_symptoms)
+    chunks = []
+    for chunk in iter_chunks(num_rows, seed, disease_symptoms, chunk_size):
+        engine.add_frame(chunk)
+        chunks.append(chunk)
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    disease_stats, symptom_freq_df, symptoms_per_disease = engine.frames()
+    return df, disease_stats, symptom_freq_df, build_monthly_data(), symptoms_per_disease
+
+
+def generate_dataset(num_rows=NUM_ROWS, seed=SEED, method="numpy", disease_symptoms=DISEASE_SYMPTOMS):
+    # method="legacy" reproduces the original random.* dataset exactly;
+    # method="numpy" is the fast default and is reproducible for a given seed
+    if method == "legacy":
+        with instrumentation.DATASET_BUILD.time(method=method):
+            return generate_dataset_legacy(num_rows, seed, disease_symptoms)
+    if method == "numpy":
+        with instrumentation.DATASET_BUILD.time(method=method):
+            return generate_dataset_numpy(num_rows, seed, disease_symptoms)
+    raise ValueError(f"Unknown dataset generation method: {method!r}")
+
+
+def cache_key(num_rows=NUM_ROWS, seed=SEED, method="numpy", disease_symptoms=DISEASE_SYMPTOMS):
+    # Key order in disease_symptoms drives generation, so it is hashed as-is (not sorted)
+    params = {
+        "version": CACHE_VERSION,
+        "num_rows": num_rows,
+        "seed": seed,
+        "method": method,
+        "disease_symptoms": disease_symptoms,
+        "severity": SEVERITY_MAP,
+        "recovery": RECOVERY_MAP,
+    }
+    if method == "numpy" and num_rows > CHUNK_SIZE:
+        # Chunking changes how the random stream is consumed, so it is part of the identity
+        params["chunk_size"] = CHUNK_SIZE
+    return hashlib.sha256(json.dumps(params).encode("utf-8")).hexdigest()[:16]
+
+
+_CACHED_FRAMES = ["df", "disease_stats", "symptom_freq", "symptoms_per_disease"]
+
+
+def _publish(staging, path):
+    # Rename a fully written staging directory into place so readers never see partial files
+    try:
+        os.rename(staging, path)
+    except OSError:
+        # Another process won the race; its copy is equivalent
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+
+
+def _write_frame(directory, name, frame):
+    # Uncompressed Arrow IPC files can be memory mapped on load
+    feather.write_feather(frame, os.path.join(directory, f"{name}.feather"), compression="uncompressed")
+
+
+def _write_cache(path, results):
+    df, disease_stats, symptom_freq_df, _, symptoms_per_disease = results
+    frames = dict(zip(_CACHED_FRAMES, [df, disease_stats, symptom_freq_df, symptoms_per_disease]))
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        for name, frame in frames.items():
+            _write_frame(staging, name, frame)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _publish(staging, path)
+
+
+def write_dataset(path, num_rows=NUM_ROWS, seed=SEED, disease_symptoms=DISEASE_SYMPTOMS, chunk_size=CHUNK_SIZE):
+    # Streams the NumPy generator into a cache entry: each chunk is appended to df.feather and
+    # absorbed by the aggregation engine, then dropped, so memory stays bounded by chunk_size
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    engine = _aggregation_engine(disease_symptoms)
+    start = time.perf_counter()
+    try:
+        writer = None
+        try:
+            for chunk in iter_chunks(num_rows, seed, disease_symptoms, chunk_size):
+                batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pa.ipc.new_file(os.path.join(staging, "df.feather"), batch.schema)
+                writer.write_batch(batch)
+                engine.add_frame(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        for name, frame in zip(["disease_stats", "symptom_freq", "symptoms_per_disease"], engine.frames()):
+            _write_frame(staging, name, frame)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _publish(staging, path)
+    instrumentation.DATASET_BUILD.observe(time.perf_counter() - start, method="numpy")
+
+
+def _read_frame(path, name):
+    # split_blocks keeps each numeric column a view of the mapped file instead of copying it
+    # into one consolidated block; the pages stay file-backed and read-only
+    table = feather.read_table(os.path.join(path, f"{name}.feather"), memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def _read_cache(path):
+    frames = {name: _read_frame(path, name) for name in _CACHED_FRAMES}
+    return (frames["df"], frames["disease_stats"], frames["symptom_freq"], build_monthly_data(),
+            frames["symptoms_per_disease"])
+
+
+def _prune_cache(cache_dir, keep=CACHE_MAX_ENTRIES):
+    # Parameter changes produce a new key; keep only the most recently used entries
+    entries = [
+        os.path.join(cache_dir, entry) for entry in os.listdir(cache_dir) if not entry.startswith(".tmp-")
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_dataset(num_rows=NUM_ROWS, seed=SEED, method="numpy", disease_symptoms=DISEASE_SYMPTOMS,
+                 cache_dir=CACHE_DIR):
+    # generate_dataset() backed by the on-disk cache; cache_dir=None disables it
+    if cache_dir is None:
+        return generate_dataset(num_rows, seed, method, disease_symptoms)
+
+    key = cache_key(num_rows, seed, method, disease_symptoms)
+    path = os.path.join(cache_dir, key)
+    if os.path.isdir(path):
+        try:
+            results = _read_cache(path)
+            os.utime(path)
+            instrumentation.DATASET_CACHE.inc(result="hit")
+            return results
+        except (OSError, pa.ArrowInvalid, KeyError):
+            # Corrupt or incomplete entry, rebuild it below
+            shutil.rmtree(path, ignore_errors=True)
+
+    instrumentation.DATASET_CACHE.inc(result="miss")
+    try:
+        if method == "numpy":
+            # Written straight to disk chunk by chunk, then read back memory mapped
+            write_dataset(path, num_rows, seed, disease_symptoms)
+            results = _read_cache(path)
+        else:
+            results = generate_dataset(num_rows, seed, method, disease_symptoms)
+            _write_cache(path, results)
+        _prune_cache(cache_dir)
+        return results
+    except OSError as exc:
+        # A read-only or full disk should not take the app down
+        print(f"Could not write dataset cache to {path}: {exc}", file=sys.stderr)
+    return generate_dataset(num_rows, seed, method, disease_symptoms)
+
+
+PRODUCTS = ("df", "disease_stats", "symptom_freq", "monthly_data", "symptoms_per_disease")
+
+# Built from df on first request and stored in the same cache entry
+DERIVED_PRODUCTS = ("cooccurrence", "disease_given_symptom")
+
+
+def _build_derived(df):
+    from cooccurrence import build_tables
+
+    return dict(zip(DERIVED_PRODUCTS, build_tables(df)))
+
+
+def _load_derived(name, num_rows, seed, method, disease_symptoms, cache_dir):
+    df = load_product("df", num_rows, seed, method, disease_symptoms, cache_dir)
+    frames = _build_derived(df)
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, cache_key(num_rows, seed, method, disease_symptoms))
+        try:
+            for derived, frame in frames.items():
+                atomic_write(os.path.join(path, f"{derived}.feather"),
+                             lambda staging: feather.write_feather(frame, staging, compression="uncompressed"))
+        except OSError as exc:
+            print(f"Could not write {name} to the dataset cache: {exc}", file=sys.stderr)
+    return frames[name]
+
+
+def load_product(name, num_rows=NUM_ROWS, seed=SEED, method="numpy", disease_symptoms=DISEASE_SYMPTOMS,
+                 cache_dir=CACHE_DIR):
+    # One output of load_dataset() on its own. With a warm cache only that product's file is
+    # read, so small frames like disease_stats cost the same whatever the dataset size.
+    if name not in PRODUCTS + DERIVED_PRODUCTS:
+        raise ValueError(f"Unknown dataset product: {name!r}")
+    if name == "monthly_data":
+        return build_monthly_data()
+
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, cache_key(num_rows, seed, method, disease_symptoms))
+        try:
+            frame = _read_frame(path, name)
+            os.utime(path)
+            instrumentation.DATASET_CACHE.inc(result="hit")
+            return frame
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    if name in DERIVED_PRODUCTS:
+        instrumentation.DATASET_CACHE.inc(result="miss")
+        return _load_derived(name, num_rows, seed, method, disease_symptoms, cache_dir)
+    results = load_dataset(num_rows, seed, method, disease_symptoms, cache_dir)
+    return dict(zip(PRODUCTS, results))[name]
+
+
+def check_parity(num_rows=NUM_ROWS, seed=SEED, pct_tolerance=0.5, count_tolerance=0.05):
+    # Compares the aggregates of both generators; they should agree up to sampling noise.
+    # Returns a list of human-readable mismatches (empty when the generators agree).
+    _, legacy_stats, legacy_freq, _, legacy_spd = generate_dataset_legacy(num_rows, seed)
+    _, numpy_stats, numpy_freq, _, numpy_spd = generate_dataset_numpy(num_rows, seed)
+    problems = []
+
+    def compare(name, legacy, new, key, columns, tolerance):
+        legacy = legacy.set_index(key)
+        new = new.set_index(key)
+        if set(legacy.index) != set(new.index):
+            problems.append(f"{name}: different {key} sets {sorted(set(legacy.index) ^ set(new.index))}")
+            return
+        for column in columns:
+            diff = (legacy[column] - new.loc[legacy.index, column]).abs()
+            if diff.max() > tolerance:
+                problems.append(f"{name}.{column}: max difference {diff.max():.3f} at {diff.idxmax()}")
+
+    compare("disease_stats", legacy_stats, numpy_stats, "Disease", ["Percentage"], pct_tolerance)
+    for column in ["Severity", "Recovery_Days"]:
+        merged = legacy_stats.merge(numpy_stats, on="Disease")
+        if not (merged[f"{column}_x"] == merged[f"{column}_y"]).all():
+            problems.append(f"disease_stats.{column}: values differ")
+    compare("symptom_freq_df", legacy_freq, numpy_freq, "Symptom", ["Percentage"], pct_tolerance)
+    compare("symptoms_per_disease", legacy_spd, numpy_spd, "Disease", ["min", "max"], 0)
+    compare("symptoms_per_disease", legacy_spd, numpy_spd, "Disease", ["mean", "std"], count_tolerance)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the synthetic dataset or check generator parity.")
+    parser.add_argument("--rows", type=int, default=NUM_ROWS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--method", choices=["numpy", "legacy"], default="numpy")
+    parser.add_argument("--check-parity", action="store_true", help="compare numpy and legacy aggregates")
+    parser.add_argument("--warm-cache", action="store_true", help="build the on-disk cache ahead of startup")
+    args = parser.parse_args(argv)
+
+    if args.check_parity:
+        problems = check_parity(args.rows, args.seed)
+        for problem in problems:
+            print(problem)
+        print("parity OK" if not problems else f"{len(problems)} parity mismatches")
+        sys.exit(1 if problems else 0)
+
+    start = time.perf_counter()
+    if args.warm_cache:
+        df = load_dataset(args.rows, args.seed, args.method)[0]
+        key = cache_key(args.rows, args.seed, args.method)
+        print(f"Cached {len(df):,} rows in {os.path.join(CACHE_DIR, key)} ({time.perf_counter() - start:.2f}s)")
+        return
+    df = generate_dataset(args.rows, args.seed, args.method)[0]
+    print(f"Generated {len(df):,} rows with the {args.method} generator in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
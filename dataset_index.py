@@ -0,0 +1,102 @@
+"""Filtered, paginated access to the compact dataset frame.
+
+Rows are pre-grouped by disease (one stable argsort, then each disease is a contiguous slice),
+and symptom filters are bitmask tests over the candidate rows, so a query touches only NumPy
+arrays. Only the rows of the requested page are turned into display text.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+import dataset
+
+Page = namedtuple("Page", ["frame", "total", "page", "pages"])
+
+# Filter results kept per index. The index is shared by every session and each entry holds up
+# to one row id per record, so only the last few filter combinations are remembered.
+QUERY_CACHE_SIZE = 4
+
+
+class DatasetIndex:
+    def __init__(self, df, vocabulary=None):
+        self.df = df
+        self.vocabulary = vocabulary or dataset.symptom_vocabulary()
+        self.diseases = list(df["Disease"].cat.categories)
+        self._disease_codes = {d: i for i, d in enumerate(self.diseases)}
+        self._bits = {s: 1 << bit for bit, s in enumerate(self.vocabulary)}
+        self.masks = df["Symptom_Mask"].to_numpy()
+        self.counts = df["Symptom_Count"].to_numpy()
+        self.row_dtype = np.int32 if len(df) < 2 ** 31 else np.int64
+        self._count_range = (int(self.counts.min()), int(self.counts.max())) if len(df) else (0, 0)
+
+        # Row numbers grouped by disease; rows stay ascending inside each group
+        codes = df["Disease"].cat.codes.to_numpy()
+        self._by_disease = np.argsort(codes, kind="stable").astype(self.row_dtype)
+        self._offsets = np.searchsorted(codes[self._by_disease], np.arange(len(self.diseases) + 1))
+        self._cached_query = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query)
+
+    def __len__(self):
+        return len(self.df)
+
+    def disease_rows(self, disease):
+        code = self._disease_codes[disease]
+        return self._by_disease[self._offsets[code]:self._offsets[code + 1]]
+
+    def symptom_mask(self, symptoms):
+        mask = 0
+        for symptom in symptoms:
+            if symptom not in self._bits:
+                raise ValueError(f"Unknown symptom: {symptom!r}")
+            mask |= self._bits[symptom]
+        return self.masks.dtype.type(mask)
+
+    def count_distribution(self):
+        # Records per symptom count, without touching the frame
+        distribution = np.bincount(self.counts)
+        nonzero = np.flatnonzero(distribution)
+        return dict(zip(nonzero.tolist(), distribution[nonzero].tolist()))
+
+    def query(self, diseases=(), required=(), excluded=(), min_count=None, max_count=None):
+        # Ascending row numbers matching every filter, read-only; count bounds covering every
+        # record are no filter, and no filter at all is just an arange, which isn't cached
+        if min_count is not None and min_count <= self._count_range[0]:
+            min_count = None
+        if max_count is not None and max_count >= self._count_range[1]:
+            max_count = None
+        if not (diseases or required or excluded) and min_count is None and max_count is None:
+            return np.arange(len(self.df), dtype=self.row_dtype)
+        return self._cached_query(tuple(diseases), tuple(required), tuple(excluded), min_count, max_count)
+
+    def _query(self, diseases, required, excluded, min_count, max_count):
+        if diseases:
+            rows = np.sort(np.concatenate([self.disease_rows(d) for d in diseases]))
+        else:
+            rows = None
+        masks = self.masks if rows is None else self.masks[rows]
+        counts = self.counts if rows is None else self.counts[rows]
+
+        keep = np.ones(len(masks), dtype=bool)
+        if required:
+            need = self.symptom_mask(required)
+            keep &= (masks & need) == need
+        if excluded:
+            keep &= (masks & self.symptom_mask(excluded)) == 0
+        if min_count is not None:
+            keep &= counts >= min_count
+        if max_count is not None:
+            keep &= counts <= max_count
+
+        matches = np.flatnonzero(keep).astype(self.row_dtype)
+        result = matches if rows is None else rows[matches]
+        # Shared between sessions through the cache
+        result.flags.writeable = False
+        return result
+
+    def page(self, rows, page=1, page_size=50):
+        # Display frame for one page of query results; page numbers start at 1
+        pages = max(1, -(-len(rows) // page_size))
+        page = min(max(1, page), pages)
+        selected = rows[(page - 1) * page_size:page * page_size]
+        frame = dataset.to_display_frame(self.df.iloc[selected], self.vocabulary)
+        return Page(frame, len(rows), page, pages)
@@ -0,0 +1,101 @@
+"""Download files for the Dataset page, built on demand and cached per dataset version.
+
+Exports are written chunk by chunk next to the dataset's cache entry, so they are dropped
+together with it when the generator parameters change.
+"""
+import gzip
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import dataset
+from atomic import atomic_write
+
+# product -> base file name
+EXPORTS = {
+    "df": "disease_symptom_dataset",
+    "disease_stats": "disease_statistics",
+    "symptom_freq": "symptom_statistics",
+}
+
+# format -> (extension, MIME type)
+FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+CHUNK_SIZE = 50000
+
+
+def file_name(product, fmt):
+    return EXPORTS[product] + FORMATS[fmt][0]
+
+
+def mime_type(fmt):
+    return FORMATS[fmt][1]
+
+
+def _chunks(product, frame, chunk_size):
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        # Symptom text only exists for the chunk being written
+        yield dataset.to_display_frame(chunk) if product == "df" else chunk
+
+
+def _write_csv(handle, chunks):
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(handle, header=i == 0, index=False)
+
+
+def _write_parquet(path, chunks):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def build_export(product, fmt, path, chunk_size=CHUNK_SIZE, cache_dir=dataset.CACHE_DIR):
+    frame = dataset.load_product(product, cache_dir=cache_dir)
+    chunks = _chunks(product, frame, chunk_size)
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            _write_csv(handle, chunks)
+    elif fmt == "csv.gz":
+        with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6) as handle:
+            _write_csv(handle, chunks)
+    elif fmt == "parquet":
+        _write_parquet(path, chunks)
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+def export_path(product, fmt, cache_dir=dataset.CACHE_DIR, chunk_size=CHUNK_SIZE):
+    # Path of the export file, building it on first use
+    if product not in EXPORTS:
+        raise ValueError(f"Unknown export: {product!r}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+    # Make sure the dataset cache entry exists before putting files inside it
+    dataset.load_product("disease_stats", cache_dir=cache_dir)
+    directory = os.path.join(cache_dir, dataset.cache_key(), "exports")
+    path = os.path.join(directory, file_name(product, fmt))
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    return atomic_write(path, lambda staging: build_export(product, fmt, staging, chunk_size=chunk_size,
+                                                           cache_dir=cache_dir))
+
+
+def read_export(product, fmt, cache_dir=dataset.CACHE_DIR):
+    with open(export_path(product, fmt, cache_dir=cache_dir), "rb") as handle:
+        return handle.read()
@@ -0,0 +1,158 @@
+"""In-process gateway in front of the shared model.
+
+Every Streamlit session thread submits its prediction here instead of calling the model
+directly. A fixed pool of worker threads runs the model calls, so at most `workers` of them
+compete for the CPU however many sessions are active. Requests wait in a bounded queue; when
+it is full the caller gets GatewayBusy straight away, and a request that waits longer than
+its timeout raises GatewayTimeout (and is skipped if it has not started yet). After close()
+new requests get GatewayClosed.
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import numpy as np
+
+import predictor
+
+WORKERS = int(os.environ.get("DISEASE_GATEWAY_WORKERS", "") or min(2, os.cpu_count() or 1))
+MAX_QUEUE = int(os.environ.get("DISEASE_GATEWAY_QUEUE", "") or 32)
+TIMEOUT = float(os.environ.get("DISEASE_GATEWAY_TIMEOUT", "") or 10.0)
+
+
+class GatewayBusy(RuntimeError):
+    pass
+
+
+class GatewayClosed(GatewayBusy):
+    pass
+
+
+class GatewayTimeout(TimeoutError):
+    pass
+
+
+class RollingStats:
+    # Percentiles over the most recent `window` samples; latencies are recorded in seconds
+    # and reported in milliseconds via `scale`
+    def __init__(self, window=10000, scale=1000):
+        self.samples = deque(maxlen=window)
+        self.scale = scale
+        self.count = 0
+
+    def record(self, value):
+        self.samples.append(value)
+        self.count += 1
+
+    def percentiles(self, points=(50, 90, 99)):
+        if not self.samples:
+            return {f"p{p}": None for p in points}
+        values = np.percentile(np.fromiter(self.samples, dtype=float), points) * self.scale
+        return {f"p{p}": round(float(v), 3) for p, v in zip(points, values)}
+
+
+class InferenceGateway:
+    def __init__(self, model, workers=WORKERS, max_queue=MAX_QUEUE, timeout=TIMEOUT):
+        self.model = model
+        self.workers = workers
+        self.timeout = timeout
+        self.queue_wait = RollingStats()
+        self.service_time = RollingStats()
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timed_out": 0, "expired": 0}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"inference-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def submit(self, fn, *args):
+        # Queues fn(model, *args) and returns a Future; raises GatewayBusy when the queue is full
+        future = Future()
+        # Under the lock, so nothing is queued behind close()'s stop sentinels
+        with self._lock:
+            if self._closed:
+                raise GatewayClosed("Inference gateway is closed")
+            try:
+                self._queue.put_nowait((fn, args, future, time.perf_counter()))
+            except queue.Full:
+                self.counters["rejected"] += 1
+                raise GatewayBusy(f"Inference queue is full ({self._queue.maxsize} waiting)") from None
+        self._count("submitted")
+        return future
+
+    def call(self, fn, *args, timeout=None):
+        future = self.submit(fn, *args)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            # Not started yet: drop it; already running: let it finish but stop waiting
+            future.cancel()
+            self._count("timed_out")
+            raise GatewayTimeout("Timed out waiting for the model") from None
+
+    def predict_topk(self, texts, k=3, timeout=None):
+        return self.call(predictor.predict_topk, texts, k, timeout=timeout)
+
+    def timed_topk(self, texts, k=3, timeout=None):
+        # Same result as predictor.timed_topk; the queue wait is not part of the stage timings
+        return self.call(predictor.timed_topk, texts, k, timeout=timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fn, args, future, enqueued = item
+            if not future.set_running_or_notify_cancel():
+                # The caller gave up while it was queued
+                self._count("expired")
+                continue
+            started = time.perf_counter()
+            self.queue_wait.record(started - enqueued)
+            with self._lock:
+                self._in_flight += 1
+            try:
+                future.set_result(fn(self.model, *args))
+                self._count("completed")
+            except BaseException as exc:
+                future.set_exception(exc)
+                self._count("failed")
+            finally:
+                self.service_time.record(time.perf_counter() - started)
+                with self._lock:
+                    self._in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            in_flight = self._in_flight
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "in_flight": in_flight,
+            "queue_wait_ms": self.queue_wait.percentiles(),
+            "service_time_ms": self.service_time.percentiles(),
+            **counters,
+        }
+
+    def close(self):
+        # Lets queued work finish, then stops the workers; may block while the queue is full
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
@@ -0,0 +1,193 @@
+"""Process-wide latency histograms and counters in the Prometheus text format.
+
+Histograms use fixed exponential buckets, so recording a value is a bisect and an increment
+under a lock; p50/p95/p99 are estimated from the buckets the same way histogram_quantile()
+does. The registry can be rendered for an HTTP endpoint (serve.py /metrics/prometheus) or
+dumped periodically to a file for node_exporter's textfile collector (the Streamlit app).
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from atomic import atomic_write_text
+
+# Set DISEASE_METRICS_FILE="" to turn the file dump off
+METRICS_FILE = os.environ.get(
+    "DISEASE_METRICS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "metrics.prom"),
+)
+DUMP_INTERVAL = 15.0
+
+# 50 µs to ~2 min, ×1.5 per bucket
+DEFAULT_BUCKETS = tuple(round(50e-6 * 1.5 ** i, 9) for i in range(37))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def series(self):
+        with self._lock:
+            return {key: ([*counts], total, count) for key, (counts, total, count) in self._series.items()}
+
+    def quantile(self, q, counts):
+        # Linear interpolation inside the bucket holding the q-th observation
+        count = sum(counts)
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.series().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.metrics.setdefault(name, Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self, points=(0.5, 0.95, 0.99)):
+        # Rows of {metric, labels, count, p50/p95/p99 in ms} for histograms and {metric, labels, value}
+        # for counters, for dashboards that don't speak Prometheus
+        histograms, counters = [], []
+        for metric in self.metrics.values():
+            if isinstance(metric, Histogram):
+                for key, (counts, total, count) in sorted(metric.series().items()):
+                    row = {"metric": metric.name, "labels": ", ".join(key), "count": count,
+                           "mean_ms": total / count * 1000 if count else None}
+                    for q in points:
+                        value = metric.quantile(q, counts)
+                        row[f"p{round(q * 100)}_ms"] = None if value is None else value * 1000
+                    histograms.append(row)
+            else:
+                for key, value in sorted(metric.values().items()):
+                    counters.append({"metric": metric.name, "labels": ", ".join(key), "value": value})
+        return histograms, counters
+
+    def dump(self, path):
+        # Atomic write, so a scraper never reads half a file
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        atomic_write_text(path, self.render())
+
+
+REGISTRY = Registry()
+
+MODEL_LOAD = REGISTRY.histogram("disease_model_load_seconds", "Time to load the model artifact.")
+MODEL_WARMUP = REGISTRY.histogram("disease_model_warmup_seconds", "Time to warm up a newly loaded model version.")
+DATASET_BUILD = REGISTRY.histogram(
+    "disease_dataset_build_seconds", "Time to generate the dataset and its aggregates.", ["method"])
+DATASET_CACHE = REGISTRY.counter(
+    "disease_dataset_cache_total", "Dataset cache lookups by result.", ["result"])
+PREDICTION_CACHE = REGISTRY.counter(
+    "disease_prediction_cache_total", "Prediction cache lookups by result.", ["result"])
+PREDICTION = REGISTRY.histogram(
+    "disease_prediction_seconds", "Latency of one prediction request.", ["source"])
+PAGE_RENDER = REGISTRY.histogram(
+    "disease_page_render_seconds", "Time to run the Streamlit script for a page.", ["page"])
+
+
+def start_file_dump(path=METRICS_FILE, interval=DUMP_INTERVAL, registry=REGISTRY):
+    # Rewrites `path` every `interval` seconds from a daemon thread; returns the thread
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                registry.dump(path)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
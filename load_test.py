@@ -0,0 +1,92 @@
+"""Load generator for serve.py.
+
+    python serve.py --port 8502 &
+    python load_test.py --url http://127.0.0.1:8502 --concurrency 32 --requests 5000
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+SAMPLE_SYMPTOMS = [
+    "fever", "cough", "sore throat", "runny nose", "sneezing", "headache", "muscle pain",
+    "fatigue", "chills", "shortness of breath", "chest pain", "joint pain", "rash", "nausea",
+    "vomiting", "sweating", "night sweats", "weight loss", "diarrhea", "abdominal pain",
+    "itching", "redness", "swelling", "blurred vision", "increased thirst", "loss of taste",
+]
+
+
+def _worker(url, count, latencies, errors, seed):
+    rng = random.Random(seed)
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for _ in range(count):
+        body = json.dumps({"symptoms": ", ".join(rng.sample(SAMPLE_SYMPTOMS, rng.randint(2, 5)))})
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/predict", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as exc:
+            errors.append(repr(exc))
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def fetch_metrics(url):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
+    conn.request("GET", "/metrics")
+    metrics = json.loads(conn.getresponse().read())
+    conn.close()
+    return metrics
+
+
+def run(url, concurrency, total_requests, seed=42):
+    latencies, errors = [], []
+    per_worker = [total_requests // concurrency + (i < total_requests % concurrency) for i in range(concurrency)]
+    threads = [
+        threading.Thread(target=_worker, args=(url, n, latencies, errors, seed + i))
+        for i, n in enumerate(per_worker)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = {"requests": len(latencies), "errors": len(errors), "seconds": round(elapsed, 3),
+              "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None}
+    if latencies:
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+        result["client_latency_ms"] = {"p50": round(p50, 3), "p90": round(p90, 3), "p99": round(p99, 3)}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fire concurrent prediction requests at serve.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    result = run(args.url, args.concurrency, args.requests)
+    result["server"] = fetch_metrics(args.url)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
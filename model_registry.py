@@ -0,0 +1,304 @@
+"""Versioned model directory with background hot-swap and instant rollback.
+
+Each version is a `<name>.joblib` artifact in the registry directory, with the `.sha256` and
+`.json` files train.py writes next to it. The optional ACTIVE file names the version to serve;
+without it the newest version is served, and with an empty registry the bundled MODEL_PATH.
+A version is its name plus the file's mtime and size, so an artifact replaced in place under
+the same name is reloaded too.
+
+A watcher thread polls the directory. When the wanted version changes it is loaded, warmed up
+with synthetic queries built from DISEASE_SYMPTOMS and put behind its own InferenceGateway
+before a single reference assignment swaps it in. Requests hold on to the gateway they started
+with, so in-flight predictions finish on the old version. The previous version stays loaded,
+which makes rollback a pointer swap.
+
+    python model_registry.py publish models_out/disease_predictor-20260101120000.joblib
+    python model_registry.py list
+    python model_registry.py activate 20260101120000
+    python model_registry.py rollback
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import compiled_model
+import dataset
+import instrumentation
+import predictor
+from atomic import atomic_write, atomic_write_text
+from inference_gateway import InferenceGateway
+
+REGISTRY_DIR = os.environ.get(
+    "DISEASE_MODEL_REGISTRY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"),
+)
+POLL_INTERVAL = float(os.environ.get("DISEASE_MODEL_POLL", "") or 5.0)
+ACTIVE_FILE = "ACTIVE"
+BUNDLED = "bundled"
+
+Version = namedtuple("Version", ["name", "path", "signature"])
+Deployment = namedtuple("Deployment", ["version", "model", "gateway", "loaded_at", "signature"])
+
+
+def list_versions(directory=REGISTRY_DIR):
+    # Oldest first; names are timestamps from train.py, so they sort chronologically
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return []
+    versions = []
+    for entry in entries:
+        if entry.endswith(".joblib") and not entry.startswith("."):
+            path = os.path.join(directory, entry)
+            try:
+                signature = predictor.model_signature(path)
+            except OSError:
+                # Removed since listdir()
+                continue
+            name = predictor.model_metadata(path).get("version") or os.path.splitext(entry)[0]
+            versions.append(Version(name, path, signature))
+    return sorted(versions)
+
+
+def read_active(directory=REGISTRY_DIR):
+    try:
+        with open(os.path.join(directory, ACTIVE_FILE), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except OSError:
+        return None
+
+
+def write_active(name, directory=REGISTRY_DIR):
+    # Atomic, so a watcher never reads a half-written name
+    atomic_write_text(os.path.join(directory, ACTIVE_FILE), name + "\n")
+
+
+def wanted_version(directory=REGISTRY_DIR, fallback=predictor.MODEL_PATH):
+    versions = list_versions(directory)
+    active = read_active(directory)
+    for version in versions:
+        if version.name == active:
+            return version
+    if versions:
+        return versions[-1]
+    return Version(BUNDLED, fallback, predictor.model_signature(fallback))
+
+
+def publish(path, directory=REGISTRY_DIR):
+    # Copies an artifact and its sidecars into the registry; the .joblib lands last so the
+    # watcher never picks up a version whose checksum or metadata is still being copied
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, os.path.basename(path))
+    for sidecar in (predictor.checksum_path(path), predictor.metadata_path(path)):
+        if os.path.exists(sidecar):
+            shutil.copyfile(sidecar, os.path.join(directory, os.path.basename(sidecar)))
+    return atomic_write(target, lambda staging: shutil.copyfile(path, staging))
+
+
+def synthetic_queries(count=64, seed=0, disease_symptoms=dataset.DISEASE_SYMPTOMS):
+    # Plausible inputs: random subsets of each disease's symptoms, in canonical (sorted) form
+    rng = random.Random(seed)
+    diseases = list(disease_symptoms)
+    queries = []
+    for i in range(count):
+        symptoms = disease_symptoms[diseases[i % len(diseases)]]
+        queries.append(", ".join(sorted(rng.sample(symptoms, rng.randint(1, len(symptoms))))))
+    return queries
+
+
+def warm_up(model, queries):
+    # One batched pass plus single-row calls, the shape of real traffic
+    predictor.predict_topk(model, queries, 3)
+    for query in queries[:16]:
+        predictor.predict_topk(model, [query], 3)
+
+
+class ModelRegistry:
+    def __init__(self, directory=REGISTRY_DIR, poll_interval=POLL_INTERVAL, keep_loaded=2,
+                 fallback=predictor.MODEL_PATH, compiled=compiled_model.ENABLED, warmup_queries=64):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.keep_loaded = keep_loaded
+        self.fallback = fallback
+        self.compiled = compiled
+        self.queries = synthetic_queries(warmup_queries)
+        self.last_error = None
+        self._loaded = OrderedDict()  # version name -> Deployment, most recently active last
+        self._active = None
+        self._previous = None
+        # _lock guards the deployment references; _sync_lock is held across a whole
+        # check-load-swap, so two threads never load the same version twice
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self, version, warm=True):
+        start = time.perf_counter()
+        model = predictor.load_model(version.path)
+        if self.compiled:
+            model = compiled_model.compile_model(model)
+        if warm:
+            # A version that can't answer the synthetic queries is never swapped in
+            with instrumentation.MODEL_WARMUP.time():
+                warm_up(model, self.queries)
+        print(f"{predictor.format_load_stats()}; version {version.name} ready in "
+              f"{time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return Deployment(version.name, model, InferenceGateway(model), time.time(), version.signature)
+
+    def _swap(self, deployment):
+        # A single reference assignment: readers see either the old or the new deployment
+        evicted = []
+        with self._lock:
+            if self._active is not None and self._active.version != deployment.version:
+                self._previous = self._active
+            replaced = self._loaded.get(deployment.version)
+            if replaced is not None and replaced is not deployment:
+                # Same name, rewritten file: the old model goes
+                evicted.append(replaced)
+                if self._previous is replaced:
+                    self._previous = None
+            self._loaded[deployment.version] = deployment
+            self._loaded.move_to_end(deployment.version)
+            self._active = deployment
+            while len(self._loaded) > self.keep_loaded:
+                evicted.append(self._loaded.popitem(last=False)[1])
+                if self._previous is evicted[-1]:
+                    self._previous = None
+        # Outside the lock, since close() waits for room in a full queue; queued work still finishes
+        for old in evicted:
+            old.gateway.close()
+
+    def active(self):
+        # The deployment to use for one request; hold on to it for the whole request
+        deployment = self._active
+        if deployment is None:
+            self.sync()
+            deployment = self._active
+        return deployment
+
+    def sync(self):
+        # Brings the active deployment in line with the directory; returns True on a swap
+        with self._sync_lock:
+            if self._stop.is_set():
+                return False
+            return self._sync()
+
+    def _sync(self):
+        version = wanted_version(self.directory, self.fallback)
+        current = self._active
+        if current is not None and (current.version, current.signature) == (version.name, version.signature):
+            return False
+        self.last_error = None
+        deployment = self._loaded.get(version.name)
+        if deployment is None or deployment.signature != version.signature:
+            try:
+                deployment = self._load(version)
+            except Exception as exc:
+                # Keep serving the current version; the next poll retries
+                self.last_error = f"{version.name}: {exc}"
+                print(f"Could not load model version {version.name}: {exc}", file=sys.stderr)
+                if current is None:
+                    # Nothing to fall back on: serve it anyway and let requests report the error
+                    deployment = self._load(version, warm=False)
+                else:
+                    return False
+        self._swap(deployment)
+        return True
+
+    def rollback(self):
+        # Swaps back to the previous version straight away and pins it in ACTIVE
+        with self._sync_lock:
+            previous = self._previous
+            if previous is None:
+                raise ValueError("No previous model version is loaded")
+            if previous.version == BUNDLED:
+                raise ValueError("The bundled model is only served while the registry is empty")
+            write_active(previous.version, self.directory)
+            self._swap(previous)
+            return previous.version
+
+    def status(self):
+        with self._lock:
+            active, previous, loaded = self._active, self._previous, list(self._loaded)
+        return {
+            "active": active.version if active else None,
+            "previous": previous.version if previous else None,
+            "loaded": loaded,
+            "available": [version.name for version in list_versions(self.directory)],
+            "pinned": read_active(self.directory),
+            "last_error": self.last_error,
+        }
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.sync()
+            except Exception as exc:
+                self.last_error = str(exc)
+
+    def start(self):
+        # Loads the wanted version now, then follows the directory from a daemon thread
+        self.sync()
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        # Waits for a load in progress, so no gateway is swapped in after this
+        self._stop.set()
+        with self._sync_lock, self._lock:
+            deployments = list(self._loaded.values())
+        for deployment in deployments:
+            deployment.gateway.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry.")
+    parser.add_argument("--dir", default=REGISTRY_DIR, help="registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show versions and which one is active")
+    publish_parser = commands.add_parser("publish", help="copy an artifact (and its sidecars) into the registry")
+    publish_parser.add_argument("path")
+    activate_parser = commands.add_parser("activate", help="pin a version")
+    activate_parser.add_argument("version")
+    commands.add_parser("unpin", help="serve the newest version again")
+    commands.add_parser("rollback", help="pin the version before the active one")
+    args = parser.parse_args(argv)
+
+    versions = list_versions(args.dir)
+    names = [version.name for version in versions]
+    if args.command == "list":
+        active = wanted_version(args.dir)
+        for name in names:
+            print(f"{'*' if name == active.name else ' '} {name}")
+        if not names:
+            print(f"* {BUNDLED} ({active.path})")
+    elif args.command == "publish":
+        print(publish(args.path, args.dir))
+    elif args.command == "activate":
+        if args.version not in names:
+            raise SystemExit(f"Unknown version {args.version!r}; available: {', '.join(names) or 'none'}")
+        write_active(args.version, args.dir)
+    elif args.command == "unpin":
+        try:
+            os.remove(os.path.join(args.dir, ACTIVE_FILE))
+        except FileNotFoundError:
+            pass
+    elif args.command == "rollback":
+        # Running processes keep the previous version loaded and swap without reloading
+        active = wanted_version(args.dir).name
+        if active not in names or names.index(active) == 0:
+            raise SystemExit("No earlier version to roll back to")
+        previous = names[names.index(active) - 1]
+        write_active(previous, args.dir)
+        print(previous)
+
+
+if __name__ == "__main__":
+    main()
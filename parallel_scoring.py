@@ -0,0 +1,148 @@
+"""Process-pool scoring that spreads shards of input across every core.
+
+Each worker loads the model once (memory mapped, so workers share the page-cached arrays) and
+pins its native thread pools to one thread to avoid oversubscription. Results come back in
+input order.
+
+    python parallel_scoring.py --max-workers 8 --rows 500000    # scaling report, 1..N workers
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from threadpoolctl import threadpool_limits
+
+import predictor
+
+# Per-process model, set by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_path, compiled, max_subset_size):
+    global _worker_model
+    threadpool_limits(1)
+    model = predictor.load_model(model_path)
+    if compiled:
+        import compiled_model
+        model = compiled_model.compile_model(model, max_subset_size)
+    _worker_model = model
+
+
+def _score_shard(texts, top_k):
+    start = time.perf_counter()
+    rankings = predictor.topk_rows(predictor.predict_topk(_worker_model, texts, top_k))
+    return os.getpid(), len(texts), time.perf_counter() - start, rankings
+
+
+class ParallelScorer:
+    def __init__(self, workers=None, model_path=predictor.MODEL_PATH, top_k=1, compiled=False,
+                 max_subset_size=0, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.top_k = top_k
+        # Bounded in-flight shards keep memory flat on unbounded input
+        self.max_pending = max_pending or 2 * self.workers
+        self.worker_stats = {}
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(model_path, compiled, max_subset_size),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def _record(self, pid, rows, seconds):
+        stats = self.worker_stats.setdefault(pid, {"rows": 0, "seconds": 0.0})
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+
+    def imap(self, items, texts_of=lambda item: item):
+        # Yields (item, rankings) in input order; only the texts are sent to the workers
+        pending = deque()
+        for item in items:
+            pending.append((item, self._executor.submit(_score_shard, list(texts_of(item)), self.top_k)))
+            if len(pending) >= self.max_pending:
+                yield self._collect(pending)
+        while pending:
+            yield self._collect(pending)
+
+    def _collect(self, pending):
+        item, future = pending.popleft()
+        pid, rows, seconds, rankings = future.result()
+        self._record(pid, rows, seconds)
+        return item, rankings
+
+    def score(self, texts, shard_size=10000):
+        texts = list(texts)
+        shards = (texts[i:i + shard_size] for i in range(0, len(texts), shard_size))
+        return [ranking for _, rankings in self.imap(shards) for ranking in rankings]
+
+    def warm_up(self):
+        # Make every worker start and load its model before timing anything
+        list(self._executor.map(_score_shard, [["fever"]] * self.workers, [1] * self.workers))
+
+    def report(self):
+        return [
+            {"pid": pid, "rows": stats["rows"], "busy_seconds": round(stats["seconds"], 4),
+             "rows_per_second": round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else None}
+            for pid, stats in sorted(self.worker_stats.items())
+        ]
+
+
+def scaling_report(texts, max_workers, model_path=predictor.MODEL_PATH, shard_size=10000, top_k=1,
+                   compiled=False):
+    # Throughput with 1..max_workers workers; efficiency = speedup / workers
+    results = []
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        with ParallelScorer(workers, model_path, top_k=top_k, compiled=compiled) as scorer:
+            scorer.warm_up()
+            scorer.worker_stats.clear()
+            start = time.perf_counter()
+            scorer.score(texts, shard_size)
+            seconds = time.perf_counter() - start
+            throughput = len(texts) / seconds
+            baseline = baseline or throughput
+            results.append({
+                "workers": workers,
+                "seconds": round(seconds, 4),
+                "rows_per_second": round(throughput, 1),
+                "speedup": round(throughput / baseline, 3),
+                "efficiency": round(throughput / (baseline * workers), 3),
+                "per_worker": scorer.report(),
+            })
+    return results
+
+
+def main(argv=None):
+    import dataset
+
+    parser = argparse.ArgumentParser(description="Measure parallel scoring throughput from 1 to N workers.")
+    parser.add_argument("--model", default=predictor.MODEL_PATH, help="path to the joblib model")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rows", type=int, default=200000, help="synthetic records to score")
+    parser.add_argument("--shard-size", type=int, default=10000)
+    parser.add_argument("--compiled", action="store_true", help="use the compiled lookup table in workers")
+    args = parser.parse_args(argv)
+
+    df = dataset.generate_dataset(num_rows=args.rows)[0]
+    texts = dataset.to_display_frame(df)["Symptoms"].tolist()
+    results = scaling_report(texts, args.max_workers, args.model, args.shard_size, compiled=args.compiled)
+    for row in results:
+        print(f"{row['workers']:3d} workers: {row['rows_per_second']:>12,.0f} rows/s  "
+              f"speedup x{row['speedup']:.2f}  efficiency {row['efficiency']:.0%}", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
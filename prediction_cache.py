@@ -0,0 +1,93 @@
+"""Process-wide LRU cache of predictions keyed on the canonical symptom set.
+
+"Fever, cough" and "cough,fever " share one entry. Entries are dropped as soon as the model
+file signature changes.
+"""
+import threading
+from collections import OrderedDict
+
+import instrumentation
+
+
+def canonical_symptoms(text):
+    # Sorted, lower-cased, de-duplicated symptom tuple
+    return tuple(sorted({s.strip().lower() for s in text.split(",") if s.strip()}))
+
+
+def canonical_text(key):
+    return ", ".join(key)
+
+
+class PredictionCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _check_signature(self, signature):
+        # Caller holds the lock
+        if signature != self._signature:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._signature = signature
+
+    def get(self, key, signature):
+        with self._lock:
+            self._check_signature(signature)
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                instrumentation.PREDICTION_CACHE.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            instrumentation.PREDICTION_CACHE.inc(result="hit")
+            return value
+
+    def put(self, key, value, signature):
+        with self._lock:
+            self._check_signature(signature)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "invalidations": self.invalidations,
+            }
+
+
+def predict_cached(cache, model, texts, signature, predict_fn):
+    # Batch helper: only the distinct cache misses go through one predict_fn(model, texts) call
+    keys = [canonical_symptoms(text) for text in texts]
+    results = [cache.get(key, signature) if key else None for key in keys]
+    missing = list(dict.fromkeys(key for key, result in zip(keys, results) if key and result is None))
+    if missing:
+        fresh = dict(zip(missing, predict_fn(model, [canonical_text(key) for key in missing])))
+        for key, value in fresh.items():
+            cache.put(key, value, signature)
+        results = [fresh[key] if result is None and key else result for key, result in zip(keys, results)]
+    # Inputs without any symptom are passed through untouched
+    raw = [i for i, key in enumerate(keys) if not key]
+    if raw:
+        for i, value in zip(raw, predict_fn(model, [texts[i] for i in raw])):
+            results[i] = value
+    return results
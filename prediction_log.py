@@ -0,0 +1,297 @@
+"""Local SQLite log of every prediction made in the app.
+
+Events are queued in memory and written by a background thread in batches, so recording one
+never waits on disk. Each batch also updates the daily and monthly summary tables in the same
+transaction, which is what the Analytics charts read; the raw events stay available for ad-hoc
+indexed queries. The database runs in WAL mode so readers never block the writer.
+
+    python prediction_log.py --simulate 1000000     # fill the log with synthetic events
+    python prediction_log.py --show                 # print the monthly trend
+    python prediction_log.py --rebuild              # recompute the summaries from the events
+"""
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+DB_PATH = os.environ.get(
+    "DISEASE_PREDICTION_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "prediction_log.sqlite3"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    disease TEXT NOT NULL,
+    confidence REAL,
+    symptom_count INTEGER NOT NULL,
+    latency_ms REAL NOT NULL,
+    cache_hit INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_day_disease ON events (day, disease);
+CREATE INDEX IF NOT EXISTS events_disease_day ON events (disease, day);
+CREATE TABLE IF NOT EXISTS daily_summary (
+    period TEXT PRIMARY KEY,
+    predictions INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    latency_ms_sum REAL NOT NULL,
+    cache_hits INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    period TEXT PRIMARY KEY,
+    predictions INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    latency_ms_sum REAL NOT NULL,
+    cache_hits INTEGER NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO {table} (period, predictions, scored, confidence_sum, latency_ms_sum, cache_hits)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (period) DO UPDATE SET
+    predictions = predictions + excluded.predictions,
+    scored = scored + excluded.scored,
+    confidence_sum = confidence_sum + excluded.confidence_sum,
+    latency_ms_sum = latency_ms_sum + excluded.latency_ms_sum,
+    cache_hits = cache_hits + excluded.cache_hits
+"""
+
+_REBUILD = """
+INSERT INTO {table} (period, predictions, scored, confidence_sum, latency_ms_sum, cache_hits)
+SELECT {period}, COUNT(*), COUNT(confidence), COALESCE(SUM(confidence), 0), SUM(latency_ms), SUM(cache_hit)
+FROM events GROUP BY 1
+"""
+
+
+def connect(path=DB_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def day_of(ts):
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+def _rollup(rows):
+    # {period: [predictions, scored, confidence_sum, latency_ms_sum, cache_hits]} per day and month
+    daily = defaultdict(lambda: [0, 0, 0.0, 0.0, 0])
+    for _, day, _, confidence, _, latency_ms, cache_hit in rows:
+        totals = daily[day]
+        totals[0] += 1
+        if confidence is not None:
+            totals[1] += 1
+            totals[2] += confidence
+        totals[3] += latency_ms
+        totals[4] += cache_hit
+    monthly = defaultdict(lambda: [0, 0, 0.0, 0.0, 0])
+    for day, totals in daily.items():
+        month = monthly[day[:7]]
+        for i, value in enumerate(totals):
+            month[i] += value
+    return daily, monthly
+
+
+def write_batch(connection, rows):
+    # rows are (ts, day, disease, confidence, symptom_count, latency_ms, cache_hit) tuples
+    daily, monthly = _rollup(rows)
+    with connection:
+        connection.executemany(
+            "INSERT INTO events (ts, day, disease, confidence, symptom_count, latency_ms, cache_hit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        for table, totals in (("daily_summary", daily), ("monthly_summary", monthly)):
+            connection.executemany(_UPSERT.format(table=table),
+                                   [(period, *values) for period, values in totals.items()])
+
+
+class PredictionLog:
+    def __init__(self, path=DB_PATH, batch_size=500, flush_interval=1.0, max_queue=100000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        connect(path).close()
+        self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, disease, confidence=None, symptom_count=0, latency_ms=0.0, cache_hit=False, ts=None):
+        # Never blocks: when the writer falls behind, events are counted and dropped
+        ts = time.time() if ts is None else ts
+        row = (ts, day_of(ts), str(disease), None if confidence is None else float(confidence),
+               int(symptom_count), float(latency_ms), int(bool(cache_hit)))
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self, first):
+        rows = [first]
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        connection = connect(self.path)
+        try:
+            while not (self._stop.is_set() and self._queue.empty()):
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                # Give a burst a moment to accumulate into one transaction
+                if self._queue.qsize() < self.batch_size and not self._stop.is_set():
+                    self._stop.wait(min(self.flush_interval, 0.05))
+                rows = self._drain(first)
+                try:
+                    write_batch(connection, rows)
+                    self.written += len(rows)
+                except sqlite3.Error as exc:
+                    # A failed batch is reported and dropped rather than stopping the writer
+                    self.dropped += len(rows)
+                    print(f"Prediction log write failed: {exc}", file=sys.stderr)
+                for _ in rows:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def flush(self):
+        # Waits until everything queued so far is on disk
+        self._queue.join()
+
+    def close(self):
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join(timeout=10)
+
+
+def _trend(table, limit, path):
+    connection = connect(path)
+    try:
+        frame = pd.read_sql_query(
+            f"SELECT period, predictions, scored, confidence_sum, latency_ms_sum, cache_hits "
+            f"FROM {table} ORDER BY period DESC LIMIT ?",
+            connection, params=(limit,),
+        )
+    finally:
+        connection.close()
+    frame = frame.iloc[::-1].reset_index(drop=True)
+    return pd.DataFrame({
+        "Period": frame["period"],
+        "Predictions": frame["predictions"],
+        "Avg_Confidence": (frame["confidence_sum"] / frame["scored"].where(frame["scored"] > 0)) * 100,
+        "Avg_Latency_ms": frame["latency_ms_sum"] / frame["predictions"],
+        "Cache_Hit_Rate": frame["cache_hits"] / frame["predictions"] * 100,
+    })
+
+
+def monthly_trend(months=12, path=DB_PATH):
+    return _trend("monthly_summary", months, path).rename(columns={"Period": "Month"})
+
+
+def daily_trend(days=30, path=DB_PATH):
+    return _trend("daily_summary", days, path).rename(columns={"Period": "Day"})
+
+
+def disease_counts(start_day=None, end_day=None, path=DB_PATH):
+    # Predictions per disease over a day range; answered from the (day, disease) index
+    connection = connect(path)
+    try:
+        return pd.read_sql_query(
+            "SELECT disease AS Disease, COUNT(*) AS Predictions FROM events "
+            "WHERE day BETWEEN ? AND ? GROUP BY disease ORDER BY Predictions DESC",
+            connection, params=(start_day or "0000-00-00", end_day or "9999-99-99"),
+        )
+    finally:
+        connection.close()
+
+
+def rebuild_summaries(path=DB_PATH):
+    connection = connect(path)
+    try:
+        with connection:
+            for table, period in (("daily_summary", "day"), ("monthly_summary", "substr(day, 1, 7)")):
+                connection.execute(f"DELETE FROM {table}")
+                connection.execute(_REBUILD.format(table=table, period=period))
+    finally:
+        connection.close()
+
+
+def simulate(count, days=365, path=DB_PATH, seed=42, batch_size=50000):
+    # Synthetic events spread over the last `days` days, for sizing the log and the charts
+    import dataset
+
+    rng = np.random.default_rng(seed)
+    diseases = list(dataset.DISEASE_SYMPTOMS)
+    now = time.time()
+    connection = connect(path)
+    try:
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            ts = now - rng.uniform(0, days * 86400, size)
+            picks = rng.integers(0, len(diseases), size)
+            confidence = rng.uniform(0.3, 1.0, size)
+            symptom_count = rng.integers(1, 6, size)
+            latency_ms = rng.gamma(2.0, 0.5, size)
+            cache_hit = rng.random(size) < 0.4
+            rows = [
+                (float(t), day_of(t), diseases[d], float(c), int(n), float(l), int(h))
+                for t, d, c, n, l, h in zip(ts, picks, confidence, symptom_count, latency_ms, cache_hit)
+            ]
+            write_batch(connection, rows)
+    finally:
+        connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or populate the prediction event log.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    parser.add_argument("--simulate", type=int, metavar="N", help="append N synthetic events")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the summary tables from the events")
+    parser.add_argument("--show", action="store_true", help="print the monthly trend")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        start = time.perf_counter()
+        simulate(args.simulate, path=args.db)
+        seconds = time.perf_counter() - start
+        print(f"Wrote {args.simulate:,} events in {seconds:.2f}s ({args.simulate / seconds:,.0f}/s)", file=sys.stderr)
+    if args.rebuild:
+        start = time.perf_counter()
+        rebuild_summaries(args.db)
+        print(f"Rebuilt summaries in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    if args.show:
+        start = time.perf_counter()
+        trend = monthly_trend(path=args.db)
+        print(trend.to_string(index=False))
+        print(f"Queried in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
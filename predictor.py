@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import resource
+import sys
+import time
+from collections import namedtuple
+
+import joblib
+import numpy as np
+
+import instrumentation
+
+# Path of the trained model, overridable for alternative deployments
+MODEL_PATH = os.environ.get(
+    "DISEASE_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "disease_predictor_model.joblib"),
+)
+
+# Numpy arrays in the artifact are memory mapped read-only by default, so every worker on a
+# host shares the page-cached copy. That only helps estimators that keep their parameters in
+# plain arrays (linear models, naive Bayes, TF-IDF weights): tree ensembles such as the bundled
+# RandomForest copy their node arrays when unpickled. Set DISEASE_MODEL_MMAP="" to load fully
+# into memory.
+MMAP_MODE = os.environ.get("DISEASE_MODEL_MMAP", "r") or None
+
+# Statistics of the most recent load_model() call in this process
+LOAD_STATS = {}
+
+
+def checksum_path(path):
+    return path + ".sha256"
+
+
+def metadata_path(path):
+    # Training metadata written next to the artifact by train.py
+    return os.path.splitext(path)[0] + ".json"
+
+
+def model_metadata(path=MODEL_PATH):
+    try:
+        with open(metadata_path(path), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_checksum(path=MODEL_PATH, digest=None):
+    # Same format as `sha256sum`, so `sha256sum -c` works too; pass digest when the bytes
+    # hashed are still at a staging path
+    digest = digest or file_sha256(path)
+    with open(checksum_path(path), "w", encoding="utf-8") as handle:
+        handle.write(f"{digest}  {os.path.basename(path)}\n")
+    return digest
+
+
+def verify_checksum(path=MODEL_PATH):
+    # Returns the digest; artifacts without a .sha256 file are not verified
+    digest = file_sha256(path)
+    if os.path.exists(checksum_path(path)):
+        with open(checksum_path(path), encoding="utf-8") as handle:
+            expected = handle.read().split()[0]
+        if digest != expected:
+            raise ValueError(f"Checksum mismatch for {path}: expected {expected}, got {digest}")
+    return digest
+
+
+def resident_memory():
+    # Current resident set size in bytes
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_model(path=MODEL_PATH, mmap_mode=MMAP_MODE, verify=True):
+    rss_before = resident_memory()
+    start = time.perf_counter()
+    digest = verify_checksum(path) if verify else None
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    LOAD_STATS.clear()
+    LOAD_STATS.update({
+        "path": path,
+        "version": model_metadata(path).get("version"),
+        "sha256": digest,
+        "mmap_mode": mmap_mode,
+        "seconds": time.perf_counter() - start,
+        "rss_bytes": resident_memory(),
+        "rss_delta_bytes": resident_memory() - rss_before,
+    })
+    instrumentation.MODEL_LOAD.observe(LOAD_STATS["seconds"])
+    return model
+
+
+def format_load_stats(stats=None):
+    stats = stats or LOAD_STATS
+    return (
+        f"Loaded {os.path.basename(stats['path'])}"
+        f"{' v' + stats['version'] if stats.get('version') else ''} in {format_duration(stats['seconds'])} "
+        f"(mmap={stats['mmap_mode'] or 'off'}, +{stats['rss_delta_bytes'] / 2**20:.1f} MiB, "
+        f"RSS {stats['rss_bytes'] / 2**20:.1f} MiB)"
+    )
+
+
+# Top-k labels and scores per input, arrays of shape (n, k). kind is "probability" when the
+# classifier has predict_proba, "decision" for decision_function scores and None when it only
+# predicts labels (k is then 1 and scores are NaN).
+TopK = namedtuple("TopK", ["labels", "scores", "kind"])
+
+
+def score_method(estimator):
+    if hasattr(estimator, "predict_proba"):
+        return "predict_proba", "probability"
+    if hasattr(estimator, "decision_function"):
+        return "decision_function", "decision"
+    return "predict", None
+
+
+def _top_k(classes, output, k, kind):
+    if kind is None:
+        labels = np.asarray(output).reshape(-1, 1)
+        return TopK(labels, np.full(labels.shape, np.nan), None)
+    scores = np.asarray(output, dtype=float)
+    if scores.ndim == 1:
+        # Binary decision_function returns the score of the positive class only
+        scores = np.column_stack([-scores, scores])
+    k = max(1, min(k, scores.shape[1]))
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    return TopK(np.asarray(classes)[top], np.take_along_axis(top_scores, order, axis=1), kind)
+
+
+def predict_topk(model, texts, k=3):
+    # Ranked top-k diseases for a whole batch from a single vectorized model pass
+    texts = list(texts)
+    method, kind = score_method(model)
+    if not texts:
+        return TopK(np.empty((0, 0), dtype=object), np.empty((0, 0)), kind)
+    return _top_k(getattr(model, "classes_", None), getattr(model, method)(texts), k, kind)
+
+
+def topk_rows(result):
+    # [(label, score), ...] per input, with native Python values
+    return [
+        [(_native(label), None if np.isnan(score) else float(score)) for label, score in zip(labels, scores)]
+        for labels, scores in zip(result.labels, result.scores)
+    ]
+
+
+def _native(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def timed_topk(model, texts, k=3):
+    # predict_topk while timing each pipeline stage with a high-resolution clock.
+    # Returns the TopK result, the total seconds and a list of (stage name, seconds).
+    texts = list(texts)
+    stages = []
+    start = time.perf_counter()
+    if hasattr(model, "steps"):
+        data = texts
+        for name, step in model.steps[:-1]:
+            if step is None or step == "passthrough":
+                continue
+            step_start = time.perf_counter()
+            data = step.transform(data)
+            stages.append((name, time.perf_counter() - step_start))
+        name, final = model.steps[-1]
+    else:
+        data, name, final = texts, type(model).__name__, model
+    method, kind = score_method(final)
+    step_start = time.perf_counter()
+    result = _top_k(getattr(final, "classes_", None), getattr(final, method)(data), k, kind)
+    stages.append((name, time.perf_counter() - step_start))
+    return result, time.perf_counter() - start, stages
+
+
+def format_duration(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def model_signature(path=MODEL_PATH):
+    # Changes whenever the model file is replaced or rewritten
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,219 @@
+"""Standalone prediction service that micro-batches concurrent requests.
+
+Run next to the Streamlit UI:
+    python serve.py --port 8502 --max-batch-size 64 --max-wait-ms 5
+
+POST /predict   {"symptoms": "fever, cough", "top_k": 3} or {"symptoms": ["fever, cough", "rash"]}
+GET  /metrics   latency percentiles and batching stats
+GET  /metrics/prometheus   process metrics in the Prometheus text format
+GET  /health
+"""
+import argparse
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import compiled_model
+import instrumentation
+from inference_gateway import RollingStats
+from predictor import LOAD_STATS, MODEL_PATH, format_load_stats, load_model, predict_topk, topk_rows
+
+
+class MicroBatcher:
+    # Collects requests arriving within max_wait into one vectorized model call
+    def __init__(self, model, max_batch_size=64, max_wait_ms=5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = None
+        self.batch_sizes = RollingStats(scale=1)
+        self.model_latency = RollingStats()
+        self._worker = None
+        # A request that didn't fit the previous batch; it opens the next one
+        self._held = None
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, texts, k=1):
+        # Lists longer than a batch are queued in batch-sized parts, so no model call is larger
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, len(texts), self.max_batch_size):
+            future = loop.create_future()
+            await self.queue.put((texts[start:start + self.max_batch_size], k, future))
+            futures.append(future)
+        parts = await asyncio.gather(*futures)
+        return [row for rows, _ in parts for row in rows], parts[0][1]
+
+    async def _collect(self):
+        items = [self._held or await self.queue.get()]
+        self._held = None
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                self._held = item
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            texts = [text for item_texts, _, _ in items for text in item_texts]
+            k = max(item_k for _, item_k, _ in items)
+            start = time.perf_counter()
+            try:
+                # The model call is CPU bound, keep it off the event loop
+                result = await loop.run_in_executor(None, predict_topk, self.model, texts, k)
+            except Exception as exc:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.model_latency.record(time.perf_counter() - start)
+            self.batch_sizes.record(len(texts))
+
+            rows = topk_rows(result)
+            offset = 0
+            for item_texts, item_k, future in items:
+                n = len(item_texts)
+                if not future.done():
+                    future.set_result(([row[:item_k] for row in rows[offset:offset + n]], result.kind))
+                offset += n
+
+
+def create_app(model, max_batch_size=64, max_wait_ms=5.0, top_k=3, max_request_texts=1000):
+    batcher = MicroBatcher(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    model_load = dict(LOAD_STATS)
+    request_latency = RollingStats()
+
+    async def predict(request):
+        start = time.perf_counter()
+        try:
+            payload = await request.json()
+            symptoms = payload["symptoms"]
+        except Exception:
+            return JSONResponse({"error": "Expected a JSON body with a 'symptoms' field"}, status_code=400)
+
+        try:
+            k = int(payload.get("top_k", top_k))
+        except (TypeError, ValueError):
+            return JSONResponse({"error": "'top_k' must be an integer"}, status_code=400)
+        if k < 1:
+            return JSONResponse({"error": "'top_k' must be at least 1"}, status_code=400)
+
+        if not isinstance(symptoms, (str, list)):
+            return JSONResponse({"error": "'symptoms' must be a string or a list of strings"}, status_code=400)
+        single = isinstance(symptoms, str)
+        texts = [symptoms] if single else symptoms
+        if len(texts) > max_request_texts:
+            return JSONResponse({"error": f"At most {max_request_texts} symptom strings per request"},
+                                status_code=413)
+        if not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+            return JSONResponse({"error": "Please provide at least one non-empty symptom string"}, status_code=400)
+
+        try:
+            rows, kind = await batcher.submit(texts, k)
+        except Exception as exc:
+            return JSONResponse({"error": f"Prediction failed: {exc}"}, status_code=500)
+        results = [
+            {
+                "prediction": row[0][0],
+                "confidence": row[0][1] if kind == "probability" else None,
+                "score_kind": kind,
+                "top_k": [{"disease": label, "score": score} for label, score in row],
+            }
+            for row in rows
+        ]
+        request_latency.record(time.perf_counter() - start)
+        instrumentation.PREDICTION.observe(time.perf_counter() - start, source="service")
+        return JSONResponse(results[0] if single else {"predictions": results})
+
+    async def metrics(request):
+        return JSONResponse({
+            "requests": request_latency.count,
+            "request_latency_ms": request_latency.percentiles(),
+            "model_latency_ms": batcher.model_latency.percentiles(),
+            "batches": batcher.batch_sizes.count,
+            "batch_size": batcher.batch_sizes.percentiles(),
+            "max_batch_size": batcher.max_batch_size,
+            "max_wait_ms": batcher.max_wait * 1000,
+            "model_load": model_load,
+        })
+
+    async def prometheus(request):
+        return PlainTextResponse(instrumentation.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await batcher.start()
+        yield
+        await batcher.stop()
+
+    app = Starlette(
+        routes=[
+            Route("/predict", predict, methods=["POST"]),
+            Route("/metrics", metrics),
+            Route("/metrics/prometheus", prometheus),
+            Route("/health", health),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.batcher = batcher
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve disease predictions over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the joblib model")
+    parser.add_argument("--compiled", action="store_true", help="answer known symptom sets from a lookup table")
+    parser.add_argument("--max-subset-size", type=int, default=0,
+                        help="with --compiled, also tabulate all subsets up to this size")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="texts merged into one model call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="how long to wait for a batch to fill")
+    parser.add_argument("--top-k", type=int, default=3, help="ranked diseases returned when a request sets none")
+    parser.add_argument("--max-request-texts", type=int, default=1000,
+                        help="symptom strings accepted in one request (larger ones get 413)")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    print(format_load_stats(), flush=True)
+    if args.compiled:
+        model = compiled_model.compile_model(model, args.max_subset_size)
+    app = create_app(model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, top_k=args.top_k,
+                     max_request_texts=args.max_request_texts)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Slim export of a text pipeline for the known symptom space.
+
+The generated dataset only ever activates a few of the vectorizer's columns: one per symptom
+phrase out of thousands of hashing buckets, or the symptom words of a TF-IDF vocabulary. The
+export keeps just those columns. The vectorizer is replaced by one with a fixed vocabulary
+producing exactly them, and the classifier's per-feature weights are sliced to match and
+stored as float32 (sparse when mostly zero). The result is a plain Pipeline that loads,
+memory maps and runs like the original, so model_registry.py can publish it as is.
+
+Inputs made only of known symptoms score the same; features of unknown words are dropped.
+
+    python slim_model.py models/disease_predictor-20260101120000.joblib
+    python slim_model.py /tmp/text_pipeline.joblib -o /tmp/text_pipeline-slim.joblib --queries 500
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+
+import dataset
+import predictor
+import train
+from compiled_model import mask_texts
+
+# Per-feature attributes of the classifiers that can be sliced: linear models and multinomial
+# naive Bayes. BernoulliNB scores absent features too, so dropping columns would change it.
+PER_FEATURE = ("coef_", "feature_log_prob_", "feature_count_", "feature_all_")
+# Linear weights at or below this density are stored sparse (float64 CSR)
+SPARSE_DENSITY = 0.3
+
+
+def dataset_texts(df=None, vocabulary=None):
+    # Both text forms of every distinct symptom set in the dataset: vocabulary order (as
+    # generated and exported) and sorted (as the app sends it); returns (texts, rows covered)
+    df = dataset.load_product("df") if df is None else df
+    vocabulary = vocabulary or dataset.symptom_vocabulary()
+    masks = np.unique(df["Symptom_Mask"].to_numpy())
+    masks = masks[masks != 0]
+    texts = list(dict.fromkeys([*dataset.symptom_labels(masks, vocabulary), *mask_texts(masks, vocabulary)]))
+    return texts, len(df)
+
+
+def known_columns(vectorizer, texts):
+    # {token: column} for every feature the texts activate
+    analyzer = vectorizer.build_analyzer()
+    tokens = sorted({token for text in texts for token in analyzer(text)})
+    if isinstance(vectorizer, HashingVectorizer):
+        if vectorizer.alternate_sign:
+            raise ValueError("Hashing with alternate_sign=True has no fixed-vocabulary equivalent")
+        hasher = FeatureHasher(vectorizer.n_features, input_type="string", alternate_sign=False)
+        columns = hasher.transform([[token] for token in tokens]).indices
+        if len(set(columns)) < len(columns):
+            raise ValueError("Known tokens collide in the hashing space; retrain with more features")
+        return dict(zip(tokens, columns.tolist()))
+    if isinstance(vectorizer, CountVectorizer):
+        return {token: vectorizer.vocabulary_[token] for token in tokens if token in vectorizer.vocabulary_}
+    raise ValueError(f"Can't slim a {type(vectorizer).__name__}")
+
+
+def slim_vectorizer(vectorizer, columns, texts):
+    # Returns (fixed-vocabulary vectorizer, kept column indices in their new order)
+    keep = np.array(sorted(columns.values()), dtype=np.intp)
+    vocabulary = {token: int(np.searchsorted(keep, column)) for token, column in columns.items()}
+    if isinstance(vectorizer, HashingVectorizer):
+        # Same analyzer, binary flag and norm; plain term frequencies instead of hashed ones
+        shared = set(TfidfVectorizer().get_params()) - {"vocabulary", "use_idf"}
+        params = {name: value for name, value in vectorizer.get_params().items() if name in shared}
+        return TfidfVectorizer(**params, use_idf=False, vocabulary=vocabulary).fit(texts), keep
+    # A fresh vectorizer of the same kind, so its internal TF-IDF transformer is sized for the
+    # kept columns; with a fixed vocabulary, fit() only sets up the vocabulary
+    params = dict(vectorizer.get_params(), vocabulary=vocabulary)
+    slim = type(vectorizer)(**params).fit(texts)
+    if getattr(slim, "use_idf", False):
+        slim.idf_ = vectorizer.idf_[keep]
+    return slim, keep
+
+
+def slim_classifier(classifier, keep):
+    slim = copy.deepcopy(classifier)
+    sliced = []
+    for name in PER_FEATURE:
+        weights = getattr(classifier, name, None)
+        if weights is None or not isinstance(weights, np.ndarray) or weights.shape[-1] != classifier.n_features_in_:
+            continue
+        weights = weights[..., keep]
+        if weights.dtype.kind == "f":
+            weights = weights.astype(np.float32)
+        setattr(slim, name, weights)
+        sliced.append(name)
+    if not sliced or type(classifier).__name__ == "BernoulliNB":
+        raise ValueError(f"Can't slim a {type(classifier).__name__}: needs linear or multinomial NB weights")
+    slim.n_features_in_ = len(keep)
+    if hasattr(slim, "sparsify") and np.count_nonzero(slim.coef_) <= SPARSE_DENSITY * slim.coef_.size:
+        # Sparse-sparse products need matching dtypes and the vectorizer emits float64
+        slim.coef_ = slim.coef_.astype(np.float64)
+        slim.sparsify()
+    return slim
+
+
+def slim(pipeline, texts):
+    # Returns the slim Pipeline; texts are the inputs it must score exactly like the original
+    if not isinstance(pipeline, Pipeline) or len(pipeline.steps) != 2:
+        raise ValueError(f"Slim export needs a (vectorizer, classifier) Pipeline, got {type(pipeline).__name__}")
+    (vectorizer_name, vectorizer), (classifier_name, classifier) = pipeline.steps
+    columns = known_columns(vectorizer, texts)
+    if not columns:
+        raise ValueError("The known symptoms activate no features of this vectorizer")
+    slim_vec, keep = slim_vectorizer(vectorizer, columns, texts)
+    return Pipeline([(vectorizer_name, slim_vec), (classifier_name, slim_classifier(classifier, keep))])
+
+
+def compare(original, slim, texts, batch_size=4096):
+    # Predicted labels must match exactly; scores may differ by float32 rounding
+    method, _ = predictor.score_method(original)
+    label_mismatches = ranking_mismatches = 0
+    max_abs_error = 0.0
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        expected = np.asarray(getattr(original, method)(batch), dtype=np.float64)
+        actual = np.asarray(getattr(slim, method)(batch), dtype=np.float64)
+        label_mismatches += int((original.predict(batch) != slim.predict(batch)).sum())
+        if expected.ndim == 2:
+            ranking_mismatches += int((np.argsort(-expected, axis=1) != np.argsort(-actual, axis=1)).any(axis=1).sum())
+        max_abs_error = max(max_abs_error, float(np.abs(expected - actual).max()))
+    return {"checked": len(texts), "label_mismatches": label_mismatches,
+            "ranking_mismatches": ranking_mismatches, "max_abs_error": max_abs_error,
+            "ok": not label_mismatches}
+
+
+def query_latency(model, texts, k=3):
+    # Median and p99 seconds of one single-text predict_topk call, the app's request shape
+    samples = []
+    for text in texts:
+        start = time.perf_counter()
+        predictor.predict_topk(model, [text], k)
+        samples.append(time.perf_counter() - start)
+    return np.percentile(samples, [50, 99])
+
+
+def weight_bytes(model):
+    classifier = model.steps[-1][1]
+    total = 0
+    for name in PER_FEATURE:
+        weights = getattr(classifier, name, None)
+        if sp.issparse(weights):
+            total += weights.data.nbytes + weights.indices.nbytes + weights.indptr.nbytes
+        elif isinstance(weights, np.ndarray):
+            total += weights.nbytes
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a pruned, float32 copy of a text pipeline.")
+    parser.add_argument("model", nargs="?", default=predictor.MODEL_PATH, help="path to the joblib pipeline")
+    parser.add_argument("-o", "--output", help="slim artifact path (default: <model>-slim.joblib)")
+    parser.add_argument("--queries", type=int, default=2000, help="single-text queries per latency measurement")
+    args = parser.parse_args(argv)
+    output = args.output or os.path.splitext(args.model)[0] + "-slim.joblib"
+
+    original = predictor.load_model(args.model)
+    texts, rows = dataset_texts()
+    start = time.perf_counter()
+    try:
+        slimmed = slim(original, texts)
+        seconds = time.perf_counter() - start
+        # Every row's text is one of these, so this covers the full dataset
+        report = compare(original, slimmed, texts)
+    except ValueError as exc:
+        raise SystemExit(f"{args.model}: {exc}")
+    print(f"Kept {len(slimmed.steps[0][1].vocabulary_)} of {original.steps[-1][1].n_features_in_:,} features "
+          f"in {seconds:.2f}s", file=sys.stderr)
+    print(f"Checked {report['checked']:,} distinct texts ({rows:,} rows): {report['label_mismatches']} label "
+          f"mismatches, {report['ranking_mismatches']} ranking mismatches, max score error "
+          f"{report['max_abs_error']:.2e}", file=sys.stderr)
+    if not report["ok"]:
+        raise SystemExit("Slim model disagrees with the original; nothing written")
+
+    metadata = dict(predictor.model_metadata(args.model), slim_of=os.path.basename(args.model),
+                    n_features=len(slimmed.steps[0][1].vocabulary_), verified_texts=report["checked"],
+                    max_abs_error=report["max_abs_error"])
+    if metadata.get("version"):
+        metadata["version"] += "-slim"
+    train.save(slimmed, metadata, output)
+    slimmed = predictor.load_model(output)
+
+    queries = [texts[i % len(texts)] for i in range(args.queries)]
+    rows_out = []
+    for label, model, path in (("original", original, args.model), ("slim", slimmed, output)):
+        query_latency(model, queries[:100])
+        p50, p99 = query_latency(model, queries)
+        rows_out.append((label, os.path.getsize(path), weight_bytes(model), p50, p99))
+    print(f"{'':<10}{'artifact':>12}{'weights':>12}{'p50/query':>12}{'p99/query':>12}")
+    for label, size, weights, p50, p99 in rows_out:
+        print(f"{label:<10}{size / 1024:>9.1f} KiB{weights / 1024:>8.1f} KiB"
+              f"{predictor.format_duration(p50):>12}{predictor.format_duration(p99):>12}")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
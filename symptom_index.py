@@ -0,0 +1,207 @@
+"""Maps free-text symptom tokens onto the known symptom vocabulary.
+
+Lookups go exact/synonym hash -> prefix -> bounded edit distance, and results are memoized
+per token, so repeated tokens cost a dictionary lookup.
+"""
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+
+# Common phrasings that should land on a vocabulary symptom
+SYNONYMS = {
+    "high temperature": "fever",
+    "temperature": "fever",
+    "pyrexia": "fever",
+    "feverish": "fever",
+    "tiredness": "fatigue",
+    "tired": "fatigue",
+    "exhaustion": "fatigue",
+    "lethargy": "fatigue",
+    "coughing": "cough",
+    "dry cough": "cough",
+    "throat pain": "sore throat",
+    "scratchy throat": "sore throat",
+    "stuffy nose": "runny nose",
+    "nasal congestion": "runny nose",
+    "head ache": "headache",
+    "migraine": "headache",
+    "body aches": "muscle pain",
+    "body ache": "muscle pain",
+    "aching muscles": "muscle pain",
+    "myalgia": "muscle pain",
+    "shivering": "chills",
+    "shivers": "chills",
+    "breathlessness": "shortness of breath",
+    "difficulty breathing": "shortness of breath",
+    "short of breath": "shortness of breath",
+    "chest tightness": "chest pain",
+    "aching joints": "joint pain",
+    "skin rash": "rash",
+    "feeling sick": "nausea",
+    "queasy": "nausea",
+    "throwing up": "vomiting",
+    "being sick": "vomiting",
+    "sweats": "sweating",
+    "losing weight": "weight loss",
+    "loose stools": "diarrhea",
+    "diarrhoea": "diarrhea",
+    "stomach ache": "abdominal pain",
+    "stomach pain": "abdominal pain",
+    "belly pain": "abdominal pain",
+    "itchy": "itching",
+    "itchiness": "itching",
+    "red skin": "redness",
+    "swollen": "swelling",
+    "blurry vision": "blurred vision",
+    "excessive thirst": "increased thirst",
+    "thirsty": "increased thirst",
+    "loss of smell": "loss of taste",
+    "cant taste": "loss of taste",
+}
+
+Match = namedtuple("Match", ["token", "symptom", "method"])
+
+# Longer input is cut off before matching, so a pasted document can't stall the server
+MAX_INPUT_CHARS = 1000
+
+_SEPARATORS = re.compile(r"[,;\n]+")
+_NOISE = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(token):
+    token = _NOISE.sub("", token.lower().replace("-", " "))
+    return _SPACES.sub(" ", token).strip()
+
+
+def split_tokens(text):
+    return [token for token in (t.strip() for t in _SEPARATORS.split(text)) if token]
+
+
+def _deletes(word, depth):
+    # Every string reachable from `word` by deleting up to `depth` characters
+    results = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a, b, limit):
+    # Optimal string alignment distance, giving up once every cell in a row exceeds `limit`
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def max_distance_for(token):
+    # Short tokens only tolerate small typos, otherwise "rash" would match "cough"-sized edits
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+class SymptomIndex:
+    def __init__(self, vocabulary, synonyms=SYNONYMS, frequencies=None, max_distance=2, min_prefix=3):
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self.max_distance = max_distance
+        self.min_prefix = min_prefix
+        # Ties between candidates go to the more common symptom
+        frequencies = frequencies or {}
+        self._rank = {s: (-frequencies.get(s, 0), s) for s in self.vocabulary}
+
+        # Exact hash lookup over vocabulary terms and synonyms
+        self._exact = {normalize(s): s for s in self.vocabulary}
+        self._synonyms = {
+            normalize(phrase): symptom for phrase, symptom in synonyms.items() if symptom in self._rank
+        }
+        terms = {**self._synonyms, **self._exact}
+
+        # Sorted keys make every prefix a contiguous range found by bisect
+        self._sorted_terms = sorted(terms)
+        self._terms = terms
+        # Keys longer than this can't prefix-match or be within max_distance of any term
+        self._max_key = max(map(len, terms), default=0) + max_distance
+
+        # Symmetric-delete index: a token within distance d of a term shares a d-deletion with it
+        self._delete_index = {}
+        for term in terms:
+            for variant in _deletes(term, max_distance):
+                self._delete_index.setdefault(variant, set()).add(term)
+
+        self.match = lru_cache(maxsize=8192)(self._match)
+
+    def _best(self, symptoms):
+        return min(symptoms, key=self._rank.__getitem__)
+
+    def _prefix(self, token):
+        start = bisect_left(self._sorted_terms, token)
+        symptoms = set()
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(token):
+                break
+            symptoms.add(self._terms[term])
+        return self._best(symptoms) if symptoms else None
+
+    def _fuzzy(self, token):
+        limit = min(self.max_distance, max_distance_for(token))
+        if limit == 0:
+            return None
+        candidates = set()
+        for variant in _deletes(token, limit):
+            candidates |= self._delete_index.get(variant, set())
+        best = None
+        for term in candidates:
+            distance = edit_distance(token, term, limit)
+            if distance <= limit:
+                key = (distance, self._rank[self._terms[term]])
+                if best is None or key < best[0]:
+                    best = (key, self._terms[term])
+        return best[1] if best else None
+
+    def _match(self, token):
+        key = normalize(token)
+        if not key:
+            return None
+        if key in self._exact:
+            return Match(token, self._exact[key], "exact")
+        if key in self._synonyms:
+            return Match(token, self._synonyms[key], "synonym")
+        if len(key) > self._max_key:
+            return None
+        if len(key) >= self.min_prefix:
+            symptom = self._prefix(key)
+            if symptom:
+                return Match(token, symptom, "prefix")
+        symptom = self._fuzzy(key)
+        if symptom:
+            return Match(token, symptom, "fuzzy")
+        return None
+
+    def canonicalize(self, text):
+        # Returns (matches for recognized tokens, unrecognized tokens); duplicates collapse
+        matches, unknown, seen = [], [], set()
+        for token in split_tokens(text[:MAX_INPUT_CHARS]):
+            match = self.match(token)
+            if match is None:
+                unknown.append(token)
+            elif match.symptom not in seen:
+                seen.add(match.symptom)
+                matches.append(match)
+        return matches, unknown
@@ -0,0 +1,155 @@
+"""Out-of-core training of the symptom-text model.
+
+Training data is streamed chunk by chunk from the seeded generator, hashed into a fixed-width
+feature space (no vocabulary to fit or hold in memory) and fed to a classifier's partial_fit,
+so the dataset size is bounded only by time. The result is a plain scikit-learn Pipeline that
+predictor.load_model() loads like any other artifact, with a checksum and a JSON metadata file.
+
+    python train.py --rows 10000000 --chunk-size 100000 --epochs 2
+    python train.py --classifier nb -o models/nb.joblib
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+import dataset
+import predictor
+from atomic import atomic_write
+from symptom_index import split_tokens
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+HOLDOUT_SEED_OFFSET = 1_000_003
+
+CLASSIFIERS = {
+    "sgd": lambda seed: SGDClassifier(loss="log_loss", alpha=1e-6, random_state=seed),
+    "nb": lambda seed: MultinomialNB(alpha=0.1),
+}
+
+
+def make_vectorizer(n_features=2 ** 12):
+    # One feature per symptom phrase; word order and duplicates don't matter
+    return HashingVectorizer(
+        tokenizer=split_tokens, token_pattern=None, n_features=n_features,
+        alternate_sign=False, binary=True, norm="l2",
+    )
+
+
+def training_chunks(num_rows, chunk_size, seed, disease_symptoms=dataset.DISEASE_SYMPTOMS):
+    # (texts, labels) per chunk; each chunk has its own seed so any chunk can be regenerated alone
+    diseases = np.array(list(disease_symptoms), dtype=object)
+    vocabulary = dataset.symptom_vocabulary(disease_symptoms)
+    for index, start in enumerate(range(0, num_rows, chunk_size)):
+        size = min(chunk_size, num_rows - start)
+        disease_idx, masks = dataset.sample_symptom_masks(size, seed + index, disease_symptoms)
+        yield list(dataset.symptom_labels(masks, vocabulary)), diseases[disease_idx]
+
+
+def evaluate(pipeline, chunks):
+    correct = total = 0
+    for texts, labels in chunks:
+        correct += int((pipeline.predict(texts) == labels).sum())
+        total += len(labels)
+    return correct / total if total else float("nan")
+
+
+def train(num_rows=dataset.NUM_ROWS, chunk_size=50000, epochs=1, classifier="sgd", seed=dataset.SEED,
+          holdout_rows=20000, n_features=2 ** 12, progress=None):
+    # Returns (pipeline, metadata)
+    vectorizer = make_vectorizer(n_features)
+    model = CLASSIFIERS[classifier](seed)
+    classes = np.array(list(dataset.DISEASE_SYMPTOMS), dtype=object)
+
+    rows_seen = 0
+    fit_seconds = 0.0
+    start = time.perf_counter()
+    for epoch in range(epochs):
+        # Later epochs draw fresh chunks rather than replaying the first pass
+        for texts, labels in training_chunks(num_rows, chunk_size, seed + epoch * num_rows):
+            step = time.perf_counter()
+            model.partial_fit(vectorizer.transform(texts), labels, classes=classes)
+            fit_seconds += time.perf_counter() - step
+            rows_seen += len(labels)
+            if progress:
+                progress(epoch, rows_seen, time.perf_counter() - start)
+    seconds = time.perf_counter() - start
+
+    pipeline = Pipeline([("hashing", vectorizer), ("clf", model)])
+    holdout = training_chunks(holdout_rows, chunk_size, seed + HOLDOUT_SEED_OFFSET)
+    metadata = {
+        "version": time.strftime("%Y%m%d%H%M%S", time.gmtime()),
+        "classifier": classifier,
+        "n_features": n_features,
+        "num_rows": num_rows,
+        "chunk_size": chunk_size,
+        "epochs": epochs,
+        "seed": seed,
+        "rows_seen": rows_seen,
+        "train_seconds": round(seconds, 3),
+        "rows_per_second": round(rows_seen / seconds, 1) if seconds else None,
+        "fit_rows_per_second": round(rows_seen / fit_seconds, 1) if fit_seconds else None,
+        "holdout_rows": holdout_rows,
+        "holdout_accuracy": round(evaluate(pipeline, holdout), 4),
+        "sklearn": sklearn.__version__,
+        "python": platform.python_version(),
+    }
+    return pipeline, metadata
+
+
+def save(pipeline, metadata, path):
+    # Checksum and metadata are written first and the artifact is renamed into place last, so a
+    # reader never sees a partial artifact or one that fails its checksum
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    saved = {}
+
+    def write(staging):
+        joblib.dump(pipeline, staging)
+        digest = predictor.write_checksum(path, predictor.file_sha256(staging))
+        saved.update(metadata, artifact=os.path.basename(path), sha256=digest)
+        with open(predictor.metadata_path(path), "w", encoding="utf-8") as handle:
+            json.dump(saved, handle, indent=2)
+            handle.write("\n")
+
+    atomic_write(path, write)
+    return saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the symptom-text model out of core.")
+    parser.add_argument("--rows", type=int, default=dataset.NUM_ROWS, help="training rows per epoch")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows per partial_fit call")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--classifier", choices=sorted(CLASSIFIERS), default="sgd")
+    parser.add_argument("--n-features", type=int, default=2 ** 12, help="hashing space width")
+    parser.add_argument("--seed", type=int, default=dataset.SEED)
+    parser.add_argument("--holdout-rows", type=int, default=20000)
+    parser.add_argument("-o", "--output", help="artifact path (default: models/disease_predictor-<version>.joblib)")
+    parser.add_argument("--progress", action="store_true", help="report throughput after every chunk")
+    args = parser.parse_args(argv)
+
+    def report(epoch, rows, elapsed):
+        print(f"epoch {epoch + 1}: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)", file=sys.stderr)
+
+    pipeline, metadata = train(args.rows, args.chunk_size, args.epochs, args.classifier, args.seed,
+                               args.holdout_rows, args.n_features, report if args.progress else None)
+    output = args.output or os.path.join(MODELS_DIR, f"disease_predictor-{metadata['version']}.joblib")
+    metadata = save(pipeline, metadata, output)
+    print(f"Trained on {metadata['rows_seen']:,} rows in {metadata['train_seconds']:.1f}s "
+          f"({metadata['rows_per_second']:,.0f} rows/s), holdout accuracy {metadata['holdout_accuracy']:.2%}",
+          file=sys.stderr)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()